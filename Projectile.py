@@ -1,31 +1,33 @@
 import glfw
-import pygame
 from OpenGL.GL import *
 import math
-import time
 import random
+import sys
+import numpy as np
+from trajectory import TIME_STEPS, as_tuples
+from cache import cached_trajectory
+from render import TrajectoryVBO, draw_balls
+from text import draw_text
+from audio import AudioTimeline, NullAudio, open_audio
+from playback import PlaybackClock, PlaybackSet
 
 # Increased Window Dimensions
 WIDTH, HEIGHT = 1900, 900
 launch_started = False  # Flag for launch trigger
 simulation_complete = False  # Flag to track when simulation ends
+playback_clock = None  # PlaybackClock started by the launch, arrow keys seek and change its speed
 
 # Store user inputs
 user_input = {"speed": "", "angle": "", "gravity": "9.81"}  # Default gravity
 input_field = "speed"  # Track which field is being edited
 launch_ready = False  # Start simulation only when inputs are complete
 
-# Initialize Pygame and Pygame Mixer for Sound Effects
-pygame.init()
-pygame.mixer.init()
-try:
-    bounce_sound = pygame.mixer.Sound(r"bounce.wav")  # Load bouncing sound effect
-    print("Sound loaded successfully.")
-except pygame.error as e:
-    print(f"Error loading sound: {e}")
-    exit()
+audio = NullAudio()  # bounce sound backend, replaced by init_audio() so the physics can be imported headless
 
-bounce_sound.set_volume(1.0)  # Set volume to maximum (valid range is 0.0 to 1.0)
+def init_audio():
+    """Open the mixer with a small pool of channels for the bounce sound."""
+    global audio
+    audio = open_audio(r"bounce.wav")
 
 def get_user_input():
     """Get user input for multiple projectiles."""
@@ -41,82 +43,56 @@ def get_user_input():
 
     return projectiles
 
-def calculate_trajectory(speed, angle, gravity, start_x=0, start_y=0, projectile_number=1):
-    """Calculate projectile motion with realistic bouncing physics."""
-    time_steps = 300  # Increased for smoother trajectory
-    trajectories = []
+def calculate_trajectory(speed, angle, gravity, start_x=0, start_y=0, projectile_number=1, as_arrays=False):
+    """Calculate projectile motion with realistic bouncing physics.
+
+    The arcs are computed by trajectory.compute_trajectory as (N, 2) NumPy arrays
+    and memoized in cache.trajectory_cache, so repeated shots are not recomputed.
+    Pass as_arrays=True to get them directly (shared, read-only), otherwise each
+    arc is converted to the old list of (x, y) tuples.
+    """
     max_bounces = 3  # Number of bounces
     e = 0.7  # Coefficient of restitution
-    previous_max_height = 0  # Track height reduction
 
     print(f"\nProjectile {projectile_number}: Initial Speed: {speed:.2f} m/s, Launch Angle: {math.degrees(angle):.2f}°")
 
-    bounce_times = []  # Track the times of each bounce
-
-    for bounce in range(max_bounces + 1):
-        t_flight = (2 * speed * math.sin(angle)) / gravity
-        dt = t_flight / time_steps
-        points = []
-        ground_hit = False  # Track if the projectile hit the ground
-        max_height = 0  # Track max height of the current bounce
-
-        for i in range(time_steps + 1):
-            t = i * dt
-            x = start_x + speed * math.cos(angle) * t
-            y = start_y + (speed * math.sin(angle) * t) - (0.5 * gravity * t**2)
-
-            if y < 0:  # Ground impact
-                y = 0
-                if not ground_hit:  # Ensure sound plays only once per bounce
-                    print("Playing bounce sound...")
-                    bounce_sound.play()
-                    ground_hit = True
-                    bounce_times.append(t)  # Record the time of the bounce
-                break
-
-            if y > max_height:
-                max_height = y  # Update max height
-        
-            points.append((x, y))
+    arcs, flight_times, speed, angle, start_x, start_y, bounce_times, max_heights = cached_trajectory(
+        speed, angle, gravity, start_x, start_y, TIME_STEPS, max_bounces, e)
 
+    trajectories = []
+    for bounce, (points, t_flight) in enumerate(zip(arcs, flight_times)):
         if bounce > 0:  # Print height reduction after the first bounce
-            height_reduction = ((previous_max_height - max_height) / previous_max_height) * 100
-            print(f"Bounce {bounce}: Max Height = {max_height:.2f} m, Reduction = {height_reduction:.2f}%")
-
-        previous_max_height = max_height  # Store the current max height for next bounce
-        trajectories.append((points, t_flight))
-
-        if bounce < max_bounces and len(points) > 0:
-            # Bounce physics
-            vy_impact = -speed * math.sin(angle)
-            vy_new = -e * vy_impact  # Reverse and reduce vertical component
-            vx = speed * math.cos(angle)
-            
-            speed = math.sqrt(vx**2 + vy_new**2)
-            angle = math.atan(vy_new / vx) if vx != 0 else 0
-            start_x, start_y = points[-1]
+            previous_max_height = max_heights[bounce - 1]
+            height_reduction = ((previous_max_height - max_heights[bounce]) / previous_max_height) * 100
+            print(f"Bounce {bounce}: Max Height = {max_heights[bounce]:.2f} m, Reduction = {height_reduction:.2f}%")
+
+        trajectories.append((points if as_arrays else as_tuples(points), t_flight))
 
     print(f"Final Speed after last bounce for Projectile {projectile_number}: {speed:.2f} m/s\n")
-    return trajectories, speed, angle, start_x, start_y, bounce_times
+    return trajectories, speed, angle, start_x, start_y, list(bounce_times)
+
+def frame_positions(playback, trajectories, colors, elapsed_time):
+    """Positions (scaled for drawing), colors and (speed, angle) reports of the balls in flight at elapsed_time.
+
+    playback is the PlaybackSet of the trajectories, every ball is found with one lookup.
+    """
+    positions, in_flight = playback.positions(elapsed_time)
+    in_flight = np.flatnonzero(in_flight)
+    return positions[in_flight], [colors[i] for i in in_flight], [trajectories[i][1:3] for i in in_flight]
 
 def draw_circle(x, y, radius=3, segments=40):  # Enlarged moving ball
     """Draws a larger moving ball."""
-    glBegin(GL_TRIANGLE_FAN)
-    glVertex2f(x, y)
-    for i in range(segments + 1):
-        theta = 2.0 * math.pi * i / segments
-        dx = radius * math.cos(theta)
-        dy = radius * math.sin(theta)
-        glVertex2f(x + dx, y + dy)
-    glEnd()
+    draw_balls([(x, y)], radius, segments=segments)
 
-def draw_trajectory(points, color):
-    """Render the entire projectile trajectory at an enlarged scale."""
+def upload_trajectory(trajectory_bounces):
+    """Upload all bounce arcs of a projectile to one vertex buffer, at the enlarged scale."""
+    points = np.concatenate([arc for arc, t_flight in trajectory_bounces])
+    return TrajectoryVBO(points / 4)  # Adjusted for better scaling
+
+def draw_trajectory(trajectory, color):
+    """Render the entire projectile trajectory (a TrajectoryVBO) in one draw call."""
     glColor3f(*color)
-    glBegin(GL_LINE_STRIP)
-    for x, y in points:
-        glVertex2f(x / 4, y / 4)  # Adjusted for better scaling
-    glEnd()
+    trajectory.draw()
 
 def draw_axes():
     """Draw X and Y axes for reference."""
@@ -163,16 +139,21 @@ def key_callback(window, key, scancode, action, mods):
                 launch_ready = True  # All inputs completed, start simulation
         elif glfw.KEY_0 <= key <= glfw.KEY_9 or key == glfw.KEY_PERIOD:  # Numeric input
             user_input[input_field] += chr(key)
+        elif playback_clock is not None:  # Playback controls once launched
+            if key == glfw.KEY_LEFT:  # Scrub back, held down it keeps going
+                playback_clock.scrub(-0.25)
+            elif key == glfw.KEY_RIGHT:
+                playback_clock.scrub(0.25)
+            elif key == glfw.KEY_UP:  # Double / halve the playback speed
+                playback_clock.set_speed(playback_clock.speed * 2)
+            elif key == glfw.KEY_DOWN:
+                playback_clock.set_speed(playback_clock.speed / 2)
+            elif key == glfw.KEY_SPACE and action == glfw.PRESS:
+                playback_clock.toggle_pause()
 
 def render_text(text, x, y, font_size=24):
-    """Render text using Pygame and display it in OpenGL."""
-    pygame.font.init()
-    font = pygame.font.Font(None, font_size)
-    text_surface = font.render(text, True, (255, 255, 255, 255))  # White text
-    
-    text_data = pygame.image.tostring(text_surface, "RGBA", True)
-    glRasterPos2f(x, y)
-    glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+    """Render white text at window pixel (x, y) from the cached glyph atlas."""
+    draw_text(text, x, y, font_size)
 
 def display_report(speed, angle, elapsed_time):
     """Display projectile data dynamically on the screen using Pygame text."""
@@ -185,84 +166,102 @@ def mouse_button_callback(window, button, action, mods):
     if button == glfw.MOUSE_BUTTON_LEFT and action == glfw.PRESS:
         launch_started = True
 
-def main():
-    global launch_started, simulation_complete, launch_ready
-    if not glfw.init():
-        return
-    
-    window = glfw.create_window(WIDTH, HEIGHT, "Projectile Simulation", None, None)
-    if not window:
-        glfw.terminate()
-        return
-    glfw.make_context_current(window)
-
-    glfw.set_key_callback(window, key_callback)  # Capture keyboard input
-    
-    # Adjust scale for better visibility
-    glOrtho(0, WIDTH / 4, 0, HEIGHT / 4, -1, 1)
-
-    glfw.set_mouse_button_callback(window, mouse_button_callback)
-
-    projectiles = get_user_input()
-    trajectories = []
-    colors = []
-    total_simulation_time = 0
-    bounce_times_all_projectiles = []  # To store the bounce times for all projectiles
-    
-    for i, (speed, angle, gravity) in enumerate(projectiles, start=1):
-        trajectory_bounces, speed, angle, start_x, start_y, bounce_times = calculate_trajectory(speed, angle, gravity, projectile_number=i)
-        trajectories.append((trajectory_bounces, speed, angle, start_x, start_y))
-        colors.append((random.random(), random.random(), random.random()))  # Generate random colors
-        bounce_times_all_projectiles.append(bounce_times)
-
-    start_time = None
-
-    while not glfw.window_should_close(window):
-        if simulation_complete:
-            break  # Stop the simulation once all projectiles have finished
-
-        glClear(GL_COLOR_BUFFER_BIT)
-        draw_axes()
+class MultiProjectileScene:
+    """The multi-projectile simulation: launches typed in on entry, played back after a click.
+
+    Uploaded trajectories are kept per (speed, angle, gravity) for the life of
+    the scene, so launching the same shots again reuses their buffers.
+    """
+
+    width, height = WIDTH, HEIGHT
+
+    def __init__(self):
+        self.buffers = {}  # (speed, angle, gravity) -> TrajectoryVBO
+
+    def enter(self):
+        global launch_started, simulation_complete, playback_clock
+        launch_started = simulation_complete = False
+        playback_clock = None
+        init_audio()
+
+        # Adjust scale for better visibility
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(0, WIDTH / 4, 0, HEIGHT / 4, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+
+        projectiles = get_user_input()
+        self.trajectories = []
+        self.trajectory_buffers = []  # GPU copies of each projectile's arcs, uploaded once
+        self.colors = []
+        impact_times = []  # every ground impact of every projectile, in seconds after the launch
+
+        for i, (speed, angle, gravity) in enumerate(projectiles, start=1):
+            trajectory_bounces, speed_out, angle_out, start_x, start_y, bounce_times = calculate_trajectory(speed, angle, gravity, projectile_number=i, as_arrays=True)
+            self.trajectories.append((trajectory_bounces, speed_out, angle_out, start_x, start_y))
+            if (speed, angle, gravity) not in self.buffers:
+                self.buffers[speed, angle, gravity] = upload_trajectory(trajectory_bounces)
+            self.trajectory_buffers.append(self.buffers[speed, angle, gravity])
+            self.colors.append((random.random(), random.random(), random.random()))  # Generate random colors
+            impact_times.append(np.cumsum([t_flight for points, t_flight in trajectory_bounces]))  # each arc ends on the ground
+
+        self.sounds = AudioTimeline(np.concatenate(impact_times) if impact_times else (), audio)
+        self.playback = PlaybackSet([trajectory_bounces for trajectory_bounces, *_ in self.trajectories], scale=1 / 4)  # drawing scale
+        self.seeks = 0
+
+    def frame(self, profiler):
+        global simulation_complete, playback_clock
+        with profiler.phase("draw"):
+            glClear(GL_COLOR_BUFFER_BIT)
+            draw_axes()
 
         if launch_started:
-            if start_time is None:
-                start_time = time.time()
-
-            elapsed_time = time.time() - start_time
-            total_time = 0
-            all_done = True  # Track if all projectiles are done
-
-            for i, (trajectory_bounces, speed, angle, start_x, start_y) in enumerate(trajectories):
-                color = colors[i]
-                total_time = 0
-
-                for bounce_index, (points, t_flight) in enumerate(trajectory_bounces):
-                    draw_trajectory(points, color)
-
-                    if elapsed_time >= total_time and elapsed_time <= total_time + t_flight:
-                        index = min(int(((elapsed_time - total_time) / t_flight) * len(points)), len(points) - 1)
-                        x, y = points[index]
-                        glColor3f(*color)
-                        draw_circle(x / 4, y / 4, radius=3)
-                        display_report(speed, angle, elapsed_time)
-                        all_done = False
-                    
-                    total_time += t_flight
-                
-                # Check if the projectile has completed all its bounces
-                for bounce_time in bounce_times_all_projectiles[i]:
-                    if elapsed_time >= bounce_time and elapsed_time <= bounce_time + 0.1:  # Allow for small window of time
-                        print("Playing bounce sound...")  # Debugging message
-                        bounce_sound.play()
+            if playback_clock is None:
+                playback_clock = PlaybackClock()
+
+            elapsed_time = playback_clock.time()
+            with profiler.phase("physics"):
+                ball_positions, ball_colors, reports = frame_positions(self.playback, self.trajectories, self.colors, elapsed_time)
+                all_done = not len(ball_positions)  # Track if all projectiles are done
+                if playback_clock.seeks != self.seeks:  # jumped, only impacts after the new time should sound
+                    self.seeks = playback_clock.seeks
+                    self.sounds.seek(elapsed_time)
+                self.sounds.update(elapsed_time)  # plays each impact once, when playback passes it
+
+            with profiler.phase("draw"):
+                for i, trajectory in enumerate(self.trajectory_buffers):
+                    draw_trajectory(trajectory, self.colors[i])
+                draw_balls(ball_positions, 3, ball_colors, segments=40)
+
+            with profiler.phase("text"):
+                for speed, angle in reports:
+                    display_report(speed, angle, elapsed_time)
 
             if all_done:
                 simulation_complete = True  # End simulation if all projectiles are done
+                print("Simulation complete!")
+                return False  # this frame, already cleared and drawn, is the last one
+
+    def leave(self):
+        global playback_clock
+        playback_clock = None
 
-        glfw.swap_buffers(window)
-        glfw.poll_events()
+    def delete(self):
+        for trajectory in self.buffers.values():
+            trajectory.delete()
+        self.buffers.clear()
 
-    glfw.terminate()
-    print("Simulation complete!")
+    on_key = staticmethod(key_callback)  # Capture keyboard input
+    on_mouse_button = staticmethod(mouse_button_callback)
+
+
+def main():
+    from scenes import run
+    run(MultiProjectileScene(), "Projectile Simulation")
 
 if __name__ == "__main__":
-    main()
+    if "--headless" in sys.argv[1:]:  # python -m projectile run --headless ...
+        from headless import main as headless_main
+        headless_main([arg for arg in sys.argv[1:] if arg != "--headless"])
+    else:
+        main()
@@ -0,0 +1,128 @@
+"""Adaptive time stepping with exact ground-contact location.
+
+    python -m adaptive --speed 120 --angle 60 --tol 1e-6
+"""
+import argparse
+import math
+import numpy as np
+from physics import GROUND_LEVEL, X_MIN, X_MAX, Y_MAX, STOP_VX, STOP_VY, calculate_points, restitution_pair
+from integrators import rk4, gravity
+from analytic import BounceTrajectory
+
+
+def adaptive_points(v_x, v_y, g, point, restitution, tol=1e-6, dt_max=0.5, dt_min=1e-9, acceleration=None,
+                    ground=GROUND_LEVEL, stop_vx=STOP_VX, stop_vy=STOP_VY, bounds=(X_MIN, X_MAX, Y_MAX)):
+    """Yield (t, [x, y]) with the step size adapted to the local error.
+
+    Steps are RK4 with step doubling: the difference between one step of dt and
+    two of dt/2 must stay below tol, dt grows up to dt_max when it does and
+    shrinks when it doesn't. When a step crosses the ground the contact time is
+    root-found to within tol and the bounce is applied there, instead of
+    snapping the position to the ground like calculate_points. Bounce, stop and
+    bounds rules are those of calculate_points. acceleration(pos, vel, t) on
+    (1, 2) arrays defaults to gravity g.
+    """
+    if acceleration is None:
+        acceleration = gravity(g)
+    rx, ry = restitution_pair(restitution)
+    pos = np.array([[point[0], point[1]]], dtype=np.float64)
+    vel = np.array([[v_x, v_y]], dtype=np.float64)
+    t = 0.0
+    dt = dt_max
+
+    while True:
+        full_pos, full_vel = rk4(pos, vel, t, dt, acceleration)
+        half_pos, half_vel = rk4(pos, vel, t, dt / 2, acceleration)
+        half_pos, half_vel = rk4(half_pos, half_vel, t + dt / 2, dt / 2, acceleration)
+        error = float(np.abs(full_pos - half_pos).max())
+        if error > tol and dt > dt_min:
+            dt = max(dt * max(0.9 * (tol / error) ** 0.2, 0.1), dt_min)
+            continue
+
+        new_pos, new_vel, step = half_pos, half_vel, dt
+        bounced = new_pos[0, 1] < ground
+        if bounced:
+            step = _contact_time(pos, vel, t, dt, acceleration, ground, tol)
+            if step is None:
+                break
+            new_pos, new_vel = rk4(pos, vel, t, step / 2, acceleration)
+            new_pos, new_vel = rk4(new_pos, new_vel, t + step / 2, step / 2, acceleration)
+            new_pos[0, 1] = ground
+            new_vel[0, 0] *= rx
+            new_vel[0, 1] = -new_vel[0, 1] * ry
+
+        pos, vel, t = new_pos, new_vel, t + step
+        if bounced and abs(vel[0, 1]) < stop_vy and (stop_vx is None or abs(vel[0, 0]) < stop_vx):
+            break
+        if bounds is not None and (pos[0, 0] > bounds[1] or pos[0, 0] < bounds[0] or pos[0, 1] > bounds[2]):
+            break
+        yield t, [float(pos[0, 0]), float(pos[0, 1])]
+
+        if error > 0:
+            dt = min(dt * min(0.9 * (tol / error) ** 0.2, 2.0), dt_max)
+        else:
+            dt = min(dt * 2.0, dt_max)
+
+
+def _contact_time(pos, vel, t, dt, acceleration, ground, tol):
+    """Time into the step at which the height comes down to the ground, by Illinois false position.
+
+    Returns None when the step starts on the ground and never rises above it
+    at the sampled points, i.e. the hop is too small to resolve.
+    """
+    def height(h):
+        p, v = rk4(pos, vel, t, h, acceleration)
+        return float(p[0, 1]) - ground
+
+    a, fa = 0.0, float(pos[0, 1]) - ground
+    b, fb = dt, height(dt)
+    if fa <= 0:  # starting on the ground, bracket from the latest sample above it
+        for h in np.linspace(dt, 0.0, 9)[1:-1]:
+            fh = height(h)
+            if fh > 0:
+                a, fa = h, fh
+                break
+        else:
+            return None
+
+    side = 0
+    c = b
+    for _ in range(100):
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = height(c)
+        if abs(fc) < tol or b - a < tol:
+            break
+        if fc > 0:  # root lies in [c, b]
+            a, fa = c, fc
+            if side == -1:
+                fb *= 0.5
+            side = -1
+        else:  # root lies in [a, c]
+            b, fb = c, fc
+            if side == 1:
+                fa *= 0.5
+            side = 1
+    return c
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="adaptive", description="Compare adaptive stepping to fixed dt.")
+    parser.add_argument("--speed", type=float, default=120.0)
+    parser.add_argument("--angle", type=float, default=60.0, help="degrees")
+    parser.add_argument("--gravity", type=float, default=9.81)
+    parser.add_argument("--tol", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    rad = math.radians(args.angle)
+    v_x, v_y = args.speed * math.cos(rad), args.speed * math.sin(rad)
+    exact = BounceTrajectory(v_x, v_y, args.gravity, (50, 50), (0.4, 0.7))
+
+    fixed = list(calculate_points(v_x, v_y, args.gravity, 0.01, [50, 50], (0.4, 0.7), []))
+    adaptive = list(adaptive_points(v_x, v_y, args.gravity, (50, 50), (0.4, 0.7), args.tol))
+    print(f"exact     bounces {exact.bounces:3d}  ends at x={exact.landing_x:.6f} t={exact.end_time:.6f}")
+    print(f"fixed dt  {len(fixed):7d} steps  last x={fixed[-1][0]:.6f} t={len(fixed) * 0.01:.6f}")
+    print(f"adaptive  {len(adaptive):7d} steps  last x={adaptive[-1][1][0]:.6f} t={adaptive[-1][0]:.6f}")
+
+
+if __name__ == "__main__":
+    main()
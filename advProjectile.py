@@ -1,7 +1,7 @@
-import time
-import glfw
 from OpenGL.GL import *
 import math
+from timestep import FixedTimestep, interpolate
+from render import TrailVBO, draw_balls
 
 
 def calculatePoints(v_x, v_y, g, dt, point, restitution):
@@ -21,15 +21,7 @@ def calculatePoints(v_x, v_y, g, dt, point, restitution):
 
 
 def draw_circle(point, r, num_segments, color):
-    glColor3f(*color)  # Set the color
-    glBegin(GL_TRIANGLE_FAN)
-    glVertex2f(point[0], point[1])  # Center of the circle
-    for i in range(num_segments + 1):
-        theta = 2.0 * math.pi * i / num_segments  # Angle in radians
-        x = r * math.cos(theta)  # X coordinate
-        y = r * math.sin(theta)  # Y coordinate
-        glVertex2f(x + point[0], y + point[1])
-    glEnd()
+    draw_balls([point[:2]], r, [color], num_segments)  # circle mesh is cached per segment count
 
 
 def draw_ground(width, height):
@@ -45,83 +37,82 @@ def draw_ground(width, height):
 
 def draw_trail(trail):
     glColor3f(0.5, 0.5, 1.0)  # Light blue for the trail
-    glBegin(GL_LINE_STRIP)
-    for point in trail:
-        glVertex2f(point[0], point[1])
-    glEnd()
-
-
-def init_window(width, height, title):
-    if not glfw.init():
-        raise Exception("GLFW initialization failed")
-
-    window = glfw.create_window(width, height, title, None, None)
-    if not window:
-        glfw.terminate()
-        raise Exception("GLFW window creation failed")
+    trail.draw()  # a TrailVBO, one draw call for the whole strip
 
-    glfw.make_context_current(window)
-    glViewport(0, 0, width, height)
 
-    glMatrixMode(GL_PROJECTION)
-    glLoadIdentity()
-    glOrtho(0, width, 0, height, -1, 1)  # Set up orthographic projection
+class BouncingScene:
+    """A single ball bouncing to a stop with its trail, one dt of physics per dt of real time."""
 
-    glMatrixMode(GL_MODELVIEW)
-    glLoadIdentity()
-
-    return window
-
-
-def main():
     # Window dimensions
-    window_width, window_height = 900, 800
-    center = [10, 10]  # Initial position of the projectile
-
-    initial_velocity = 100
-    angle = 65  # Launch angle in degrees
-    rad_angle = math.radians(angle)
-    g = 9.81
-    dt = 0.01
-    restitution = 0.7  # Energy retention coefficient (bounciness)
-
-    v_x = initial_velocity * math.cos(rad_angle)
-    v_y = initial_velocity * math.sin(rad_angle)
-    points_generator = calculatePoints(v_x, v_y, g, dt, center, restitution)
-    window = init_window(window_width, window_height, "Bouncing Projectile Simulation")
-
-    trail = []  # To store the projectile's trail
-
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glLoadIdentity()
-
-        # Draw ground
-        draw_ground(window_width, window_height)
+    width, height = 900, 800
+
+    def __init__(self):
+        self.trail = None
+
+    def enter(self):
+        center = [10, 10]  # Initial position of the projectile
+
+        initial_velocity = 100
+        angle = 65  # Launch angle in degrees
+        rad_angle = math.radians(angle)
+        g = 9.81
+        dt = 0.01
+        restitution = 0.7  # Energy retention coefficient (bounciness)
+
+        v_x = initial_velocity * math.cos(rad_angle)
+        v_y = initial_velocity * math.sin(rad_angle)
+        self.points_generator = calculatePoints(v_x, v_y, g, dt, center, restitution)
+
+        if self.trail is None:
+            self.trail = TrailVBO(500)  # To store the projectile's trail, the oldest points drop off past 500
+        self.trail.clear()
+        self.clock = FixedTimestep(dt)  # one dt of physics per dt of real time, whatever the frame rate
+        self.previous_point = self.current_point = list(center)
+
+    def frame(self, profiler):
+        finished = False
+        with profiler.phase("draw"):
+            glClear(GL_COLOR_BUFFER_BIT)
+            glLoadIdentity()
+
+            # Draw ground
+            draw_ground(self.width, self.height)
+
+        with profiler.phase("physics"):
+            for _ in range(self.clock.advance()):
+                try:
+                    # Get the next point in the projectile motion
+                    point, v_y = next(self.points_generator)
+                except StopIteration:
+                    finished = True
+                    break
+                self.previous_point, self.current_point = self.current_point, list(point)
+                self.trail.append(self.current_point)  # Add the current point to the trail
+
+        with profiler.phase("draw"):
+            # Draw the trail
+            draw_trail(self.trail)
 
-        try:
-            # Get the next point in the projectile motion
-            point, v_y = next(points_generator)
-            trail.append(list(point))  # Add the current point to the trail
+            # Draw the projectile between the last two physics steps
+            point = interpolate(self.previous_point, self.current_point, self.clock.alpha)
+            color = (1.0 - point[1] / self.height, 0.2, point[1] / self.height)  # Dynamic color
+            draw_circle(point, 8, 20, color)
 
-            # Limit the trail length for performance
-            if len(trail) > 500:
-                trail.pop(0)
+        if finished:
+            return False
 
-            # Draw the trail
-            draw_trail(trail)
+    def leave(self):
+        pass
 
-            # Draw the projectile
-            color = (1.0 - point[1] / window_height, 0.2, point[1] / window_height)  # Dynamic color
-            draw_circle(point, 8, 20, color)
-        except StopIteration:
-            break
+    def delete(self):
+        if self.trail is not None:
+            self.trail.delete()
+            self.trail = None
 
-        glfw.swap_buffers(window)
-        glfw.poll_events()
-        time.sleep(0.01)
 
-    glfw.terminate()
+def main():
+    from scenes import run
+    run(BouncingScene(), "Bouncing Projectile Simulation")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,124 @@
+import math
+import numpy as np
+from physics import GROUND_LEVEL, X_MIN, X_MAX, Y_MAX, STOP_VX, STOP_VY, restitution_pair
+
+
+class BounceTrajectory:
+    """Closed-form multi-bounce trajectory.
+
+    Each arc is a parabola, so its ground impact time, apex and post-bounce
+    velocity are solved exactly instead of stepping with a fixed dt. Building
+    the trajectory costs O(bounces) and position(t) is a binary search over
+    the arc start times.
+
+    The rules match MIprojectile.calculate_points: restitution is an (x, y)
+    pair (a single number only damps y), the flight ends on a bounce slower
+    than stop_vy vertically and stop_vx horizontally (stop_vx=None checks only
+    y, like advProjectile), and leaving bounds=(x_min, x_max, y_max) ends it too.
+    """
+
+    def __init__(self, v_x, v_y, g, point, restitution, ground=GROUND_LEVEL, stop_vx=STOP_VX, stop_vy=STOP_VY,
+                 bounds=(X_MIN, X_MAX, Y_MAX), max_bounces=1000):
+        self.gravity = g
+        self.ground = ground
+        rx, ry = restitution_pair(restitution)
+
+        starts, xs, ys, vxs, vys = [], [], [], [], []
+        self.impact_times = []  # Global times of every ground contact
+        self.apexes = []  # (t, x, y) of the highest point of each arc
+        self.out_of_bounds = False
+        x, y = float(point[0]), float(point[1])
+        t = 0.0
+
+        for _ in range(max_bounces + 1):
+            starts.append(t)
+            xs.append(x)
+            ys.append(y)
+            vxs.append(v_x)
+            vys.append(v_y)
+
+            # Positive root of y + v_y*tau - g*tau^2/2 = ground
+            tau = (v_y + math.sqrt(max(v_y**2 + 2 * g * (y - ground), 0.0))) / g
+            if v_y > 0:
+                t_apex = v_y / g
+                self.apexes.append((t + t_apex, x + v_x * t_apex, y + v_y**2 / (2 * g)))
+
+            exit_time = self._exit_time(x, y, v_x, v_y, g, bounds)
+            if exit_time is not None and exit_time < tau:
+                self.out_of_bounds = True
+                t += exit_time
+                break
+
+            t += tau
+            x += v_x * tau
+            y = ground
+            self.impact_times.append(t)
+            v_y = (g * tau - v_y) * ry
+            v_x = v_x * rx
+            if abs(v_y) < stop_vy and (stop_vx is None or abs(v_x) < stop_vx):
+                break
+
+        self.start_times = np.array(starts)
+        self.end_time = t
+        self._x = np.array(xs)
+        self._y = np.array(ys)
+        self._vx = np.array(vxs)
+        self._vy = np.array(vys)
+
+    @staticmethod
+    def _exit_time(x, y, v_x, v_y, g, bounds):
+        """Time until an arc leaves the bounds, or None if it stays inside."""
+        if bounds is None:
+            return None
+        x_min, x_max, y_max = bounds
+        times = []
+        if v_x > 0:
+            times.append((x_max - x) / v_x)
+        elif v_x < 0:
+            times.append((x_min - x) / v_x)
+        rise = v_y**2 - 2 * g * (y_max - y)
+        if v_y > 0 and rise > 0:
+            times.append((v_y - math.sqrt(rise)) / g)
+        return min(times) if times else None
+
+    @property
+    def bounces(self):
+        return len(self.impact_times)
+
+    @property
+    def landing_x(self):
+        return float(self.position(self.end_time)[0])
+
+    def arc_index(self, t):
+        """Index of the arc in flight at time t."""
+        return max(int(np.searchsorted(self.start_times, t, side="right")) - 1, 0)
+
+    def position(self, t):
+        """Exact position at time t, clamped to the flight duration."""
+        return self.positions(np.array([t]))[0]
+
+    def positions(self, times):
+        """Positions for an array of times as an (N, 2) array."""
+        times = np.clip(np.asarray(times, dtype=np.float64), 0.0, self.end_time)
+        k = np.maximum(np.searchsorted(self.start_times, times, side="right") - 1, 0)
+        tau = times - self.start_times[k]
+        out = np.empty((len(times), 2))
+        out[:, 0] = self._x[k] + self._vx[k] * tau
+        out[:, 1] = np.maximum(self._y[k] + self._vy[k] * tau - 0.5 * self.gravity * tau**2, self.ground)
+        return out
+
+    def velocity(self, t):
+        """Exact velocity at time t."""
+        k = self.arc_index(t)
+        return (float(self._vx[k]), float(self._vy[k] - self.gravity * (t - self.start_times[k])))
+
+    def sample(self, dt):
+        """Positions every dt seconds from launch to the end of the flight."""
+        return self.positions(np.append(np.arange(0.0, self.end_time, dt), self.end_time))
+
+
+def analytic_points(v_x, v_y, g, dt, point, restitution, **rules):
+    """Drop-in for the stepped generators: yields exact [x, y] positions every dt."""
+    trajectory = BounceTrajectory(v_x, v_y, g, point, restitution, **rules)
+    for x, y in trajectory.sample(dt)[1:].tolist():
+        yield [x, y]
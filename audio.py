@@ -0,0 +1,110 @@
+import os
+import threading
+import numpy as np
+
+
+class NullAudio:
+    """Backend that plays nothing, for headless runs or when no audio device can be opened."""
+
+    def __init__(self):
+        self.played = 0
+
+    def play(self):
+        self.played += 1
+
+
+class MixerAudio:
+    """One sound played through a fixed pool of pygame mixer channels.
+
+    Each play goes to the next channel in turn, so when every channel is busy
+    the one started longest ago is cut off instead of the sound being dropped
+    or the mixer allocating more voices.
+    """
+
+    def __init__(self, path, channels=8, volume=1.0):
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        self.sound = pygame.mixer.Sound(path)
+        self.sound.set_volume(volume)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.next = 0
+        self.played = 0
+
+    def play(self):
+        self.channels[self.next].play(self.sound)
+        self.next = (self.next + 1) % len(self.channels)
+        self.played += 1
+
+
+_opened = {}  # path -> backend, the mixer is opened once per process
+_open_lock = threading.Lock()
+
+
+def open_audio(path, channels=8):
+    """MixerAudio for path, or NullAudio when PROJECTILE_AUDIO=0 or the mixer or file can't be opened.
+
+    The backend is opened once per path and shared, so reopening a scene, or
+    opening it on a preload thread first, costs nothing.
+    """
+    with _open_lock:
+        backend = _opened.get(path)
+        if backend is None:
+            backend = _opened[path] = _open_audio(path, channels)
+        return backend
+
+
+def _open_audio(path, channels):
+    if os.environ.get("PROJECTILE_AUDIO", "1") == "0":
+        return NullAudio()
+    try:
+        return MixerAudio(path, channels)
+    except Exception as e:  # no audio device, missing file, ...
+        print(f"Error loading sound: {e}")
+        return NullAudio()
+
+
+class AudioTimeline:
+    """Sound events at known times, each dispatched once as playback passes it.
+
+    Times are kept sorted with a cursor at the first event not yet played, so
+    update(t) is a binary search plus one play per due event. Events due in the
+    same update are capped at max_per_update (by default the channel pool size)
+    so a pile-up of simultaneous bounces cannot flood the mixer.
+    """
+
+    def __init__(self, times=(), backend=None, max_per_update=None):
+        self.backend = backend if backend is not None else NullAudio()
+        if max_per_update is None:
+            max_per_update = len(getattr(self.backend, "channels", ())) or 8
+        self.max_per_update = max_per_update
+        self.times = np.sort(np.asarray(times, dtype=np.float64).ravel())
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, times):
+        """Schedule more events; ones earlier than the current position are not played."""
+        position = self.times[self.cursor - 1] if self.cursor else -np.inf
+        self.times = np.sort(np.concatenate([self.times, np.asarray(times, dtype=np.float64).ravel()]))
+        self.cursor = int(np.searchsorted(self.times, position, side="right"))
+
+    def seek(self, t):
+        """Move to t without playing anything, events after t play again."""
+        self.cursor = int(np.searchsorted(self.times, t, side="right"))
+
+    def update(self, t):
+        """Play every event at or before t that hasn't been played, return how many were due."""
+        end = int(np.searchsorted(self.times, t, side="right"))
+        due = end - self.cursor
+        if due > 0:
+            for _ in range(min(due, self.max_per_update)):
+                self.backend.play()
+            self.cursor = end
+        return max(due, 0)
+
+    @property
+    def done(self):
+        return self.cursor == len(self.times)
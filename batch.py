@@ -0,0 +1,90 @@
+import numpy as np
+from physics import GROUND_LEVEL, X_MIN, X_MAX, Y_MAX, STOP_VX, STOP_VY, restitution_pair
+from integrators import INTEGRATORS
+
+
+class ProjectileBatch:
+    """State of many projectiles stored as parallel arrays.
+
+    positions and velocities are (N, 2) arrays, gravity is (N,) and restitution
+    is (N, 2) holding the x and y damping applied on every ground bounce (a single
+    number or (x, y) pair is shared by all projectiles). All projectiles are
+    advanced together by step(), following the same rules as
+    MIprojectile.calculate_points. integrator names one of integrators.INTEGRATORS,
+    the default explicit Euler matches calculate_points step for step. drag is
+    a forces.Drag (per-projectile coefficients allowed) and wind a forces.Wind
+    or any field(positions, t), which acts through the drag. collider is an
+    optional collisions.Collider resolving ball-ball and obstacle contacts.
+    """
+
+    def __init__(self, positions, velocities, gravity=9.81, restitution=(0.4, 0.7), integrator="euler",
+                 drag=None, wind=None, collider=None):
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        self.velocities = np.array(velocities, dtype=np.float64).reshape(-1, 2)
+        n = len(self.positions)
+        self.gravity = np.broadcast_to(np.asarray(gravity, dtype=np.float64), (n,)).copy()
+        if np.ndim(restitution) == 0:
+            restitution = restitution_pair(restitution)
+        self.restitution = np.broadcast_to(np.asarray(restitution, dtype=np.float64), (n, 2)).copy()
+        self.active = np.ones(n, dtype=bool)
+        self.time = 0.0
+        self.integrate = INTEGRATORS[integrator]
+        self.drag = drag
+        self.wind = wind
+        self.collider = collider
+
+    @classmethod
+    def from_launches(cls, speeds, angles, start=(50, 50), gravity=9.81, restitution=(0.4, 0.7), integrator="euler",
+                      drag=None, wind=None, collider=None):
+        """Build a batch from launch speeds and angles (radians) sharing one start point."""
+        speeds = np.asarray(speeds, dtype=np.float64)
+        angles = np.asarray(angles, dtype=np.float64)
+        velocities = np.stack([speeds * np.cos(angles), speeds * np.sin(angles)], axis=-1)
+        positions = np.broadcast_to(np.asarray(start, dtype=np.float64), velocities.shape)
+        return cls(positions, velocities, gravity, restitution, integrator, drag, wind, collider)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def acceleration(self, positions, velocities, t, mask):
+        """Acceleration of the projectiles selected by mask: gravity plus drag, if any."""
+        a = np.zeros_like(velocities)
+        a[:, 1] = -self.gravity[mask]
+        if self.drag is not None:
+            relative = velocities - self.wind(positions, t) if self.wind is not None else velocities
+            a += self.drag(relative, mask)
+        return a
+
+    def step(self, dt):
+        """Advance every active projectile by dt.
+
+        Returns (bounced, out_of_bounds) boolean masks for this step. Projectiles
+        that stop bouncing or leave the bounds are marked inactive and no longer move.
+        """
+        active = self.active
+        pos = self.positions
+        vel = self.velocities
+
+        pos[active], vel[active] = self.integrate(
+            pos[active], vel[active], self.time, dt,
+            lambda p, v, t: self.acceleration(p, v, t, active))
+        if self.collider is not None:
+            self.collider.resolve(pos, vel, self.restitution, active)
+
+        bounced = active & (pos[:, 1] <= GROUND_LEVEL)
+        pos[bounced, 1] = GROUND_LEVEL
+        vel[bounced] *= self.restitution[bounced] * (1, -1)
+        stopped = bounced & (np.abs(vel[:, 1]) < STOP_VY) & (np.abs(vel[:, 0]) < STOP_VX)
+
+        out_of_bounds = active & ~stopped & ((pos[:, 0] > X_MAX) | (pos[:, 0] < X_MIN) | (pos[:, 1] > Y_MAX))
+        self.active = active & ~stopped & ~out_of_bounds
+        self.time += dt
+        return bounced, out_of_bounds
+
+    def run(self, dt, max_steps=None):
+        """Step until every projectile is inactive, yielding a view of the positions each step."""
+        steps = 0
+        while self.active.any() and (max_steps is None or steps < max_steps):
+            self.step(dt)
+            steps += 1
+            yield self.positions
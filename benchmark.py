@@ -0,0 +1,285 @@
+"""Benchmarks for the physics and rendering hot paths.
+
+    python -m benchmark                                 # run everything, print a table
+    python -m benchmark --save baseline.json            # record a baseline
+    python -m benchmark --compare baseline.json         # exit 1 if anything got slower
+    python -m benchmark --only calculate_points trail --gl real
+
+Rendering benchmarks run against a null GL by default: every gl* call the
+measured modules make is replaced by a no-op, so they time the Python side
+(layout, array building, call count) without needing a display. --gl real
+uses an invisible GLFW window and waits for the GPU after every call.
+
+Each sample times a batch of calls long enough to rise above timer and
+scheduler noise (like timeit's autorange) and reports the time per call.
+--compare only fails a benchmark that is both --threshold slower and at
+least --min-diff milliseconds slower per call than the baseline.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+SPEED, ANGLE = 60.0, 45.0
+PERCENTILES = (50, 90, 99)
+
+
+def bench_calculate_trajectory():
+    from Projectile import calculate_trajectory
+    from cache import trajectory_cache
+
+    def run():
+        trajectory_cache.clear()  # time the computation, not a cache hit
+        trajectories = calculate_trajectory(SPEED, math.radians(ANGLE), 9.81)[0]
+        return sum(len(points) for points, t_flight in trajectories)
+    return run
+
+
+def bench_calcPoints():
+    from test import calcPoints
+    rad = math.radians(ANGLE)
+
+    def run():
+        return len(calcPoints(0, 0, 9.8, 0.01, SPEED * math.cos(rad), SPEED * math.sin(rad)))
+    return run
+
+
+def bench_calculatePoints():
+    from advProjectile import calculatePoints
+    rad = math.radians(ANGLE)
+
+    def run():
+        return sum(1 for _ in calculatePoints(SPEED * math.cos(rad), SPEED * math.sin(rad), 9.81, 0.01, [50, 50], 0.7))
+    return run
+
+
+def bench_calculate_points():
+    from physics import calculate_points
+    rad = math.radians(ANGLE)
+
+    def run():
+        return sum(1 for _ in calculate_points(SPEED * math.cos(rad), SPEED * math.sin(rad), 9.81, 0.01, [50, 50],
+                                               (0.4, 0.7), []))
+    return run
+
+
+def bench_text():
+    from text import GlyphAtlas
+    atlas = GlyphAtlas(24)
+    lines = [(f"Speed: {SPEED + i:.2f} m/s  Angle: {ANGLE:.2f}°  Time: {i * 0.016:.2f}s", 10, 750 - 30 * i)
+             for i in range(10)]
+
+    def run():
+        atlas.draw(lines)
+        return len(lines)
+    return run
+
+
+def bench_trail():
+    from render import TrailVBO
+    trail = TrailVBO(500)
+    for i in range(500):
+        trail.append((i, 10 + i % 100))
+    step = [0]
+
+    def run():
+        # one frame of MIprojectile: a point is added and the whole trail drawn
+        step[0] += 1
+        trail.append((step[0] % 900, 10 + step[0] % 100))
+        trail.draw()
+        return 1
+    return run
+
+
+BENCHMARKS = {
+    "calculate_trajectory": (bench_calculate_trajectory, False),
+    "calcPoints": (bench_calcPoints, False),
+    "calculatePoints": (bench_calculatePoints, False),
+    "calculate_points": (bench_calculate_points, False),
+    "text": (bench_text, True),
+    "trail": (bench_trail, True),
+}
+GL_MODULES = ("render", "text", "advProjectile")
+
+
+@contextlib.contextmanager
+def null_gl(module_names=GL_MODULES, viewport=(0, 0, 900, 800)):
+    """Swap every gl* function of the given modules for a no-op while inside the block."""
+    import importlib
+    ids = iter(range(1, 1 << 30))
+
+    def generate(*args):
+        return next(ids)
+
+    def stub(*args, **kwargs):
+        return None
+
+    saved = []
+    for name in module_names:
+        module = importlib.import_module(name)
+        for attr, value in list(vars(module).items()):
+            if attr.startswith("gl") and attr[2:3].isupper() and callable(value):
+                saved.append((module, attr, value))
+                if attr.startswith("glGen"):
+                    replacement = generate
+                elif attr == "glGetIntegerv":
+                    replacement = lambda *args: viewport
+                else:
+                    replacement = stub
+                setattr(module, attr, replacement)
+    try:
+        yield
+    finally:
+        for module, attr, value in saved:
+            setattr(module, attr, value)
+
+
+@contextlib.contextmanager
+def real_gl(width=900, height=800):
+    """An invisible GLFW window with the same projection as the simulations."""
+    import glfw
+    from OpenGL.GL import glFinish
+    if not glfw.init():
+        raise SystemExit("GLFW initialization failed, use --gl null")
+    glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+    from utils import init_window
+    window = init_window(width, height, "benchmark")
+    try:
+        yield glFinish
+    finally:
+        glfw.destroy_window(window)
+        glfw.terminate()
+
+
+def measure(run, repeat=200, warmup=10, finish=None, min_sample=0.002):
+    """Time repeat samples of run() and one traced call for the peak allocation.
+
+    A sample is a batch of `number` calls taking at least min_sample seconds,
+    the times are per call.
+    """
+    def sample(number):
+        items = 0
+        started = time.perf_counter()
+        for _ in range(number):
+            items += run()
+            if finish is not None:
+                finish()
+        return time.perf_counter() - started, items
+
+    for _ in range(warmup):
+        run()
+    number = 1
+    while True:  # 1, 2, 5, 10, 20, 50, ... calls until a batch is long enough
+        for multiplier in (1, 2, 5):
+            if sample(number * multiplier)[0] >= min_sample:
+                number *= multiplier
+                break
+        else:
+            number *= 10
+            continue
+        break
+
+    times = np.empty(repeat)
+    items = 0
+    for i in range(repeat):
+        elapsed, count = sample(number)
+        times[i] = elapsed / number
+        items += count
+
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {"mean_ms": float(times.mean() * 1e3), "min_ms": float(times.min() * 1e3)}
+    for p, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+        result[f"p{p}_ms"] = float(value * 1e3)
+    result["throughput"] = items / float(times.sum() * number)  # points, strings or frames per second
+    result["number"] = number
+    result["peak_kb"] = peak / 1024
+    return result
+
+
+def run_benchmarks(names, repeat=200, gl="null"):
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        physics = [name for name in names if not BENCHMARKS[name][1]]
+        rendering = [name for name in names if BENCHMARKS[name][1]]
+        for name in physics:
+            results[name] = measure(BENCHMARKS[name][0](), repeat)
+        if rendering:
+            with (real_gl() if gl == "real" else null_gl()) as finish:
+                for name in rendering:
+                    results[name] = measure(BENCHMARKS[name][0](), repeat, finish=finish)
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_diff_ms=0.01):
+    """Names whose p50 time or peak memory grew by more than threshold over the baseline.
+
+    A p50 slowdown also has to exceed min_diff_ms, so microsecond benchmarks
+    don't fail on noise.
+    """
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        slower = result["p50_ms"] - old["p50_ms"]
+        if (slower > old["p50_ms"] * threshold and slower > min_diff_ms) or result["peak_kb"] > old["peak_kb"] * (1 + threshold) + 1:
+            regressions.append(name)
+    return regressions
+
+
+def report(results, baseline=None):
+    header = f"{'benchmark':<22}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'items/s':>12}{'peak KiB':>10}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    for name, r in results.items():
+        line = (f"{name:<22}{r['mean_ms']:>10.3f}{r['p50_ms']:>10.3f}{r['p90_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+                f"{r['throughput']:>12.4g}{r['peak_kb']:>10.1f}")
+        if baseline and name in baseline:
+            line += f"{(r['p50_ms'] / baseline[name]['p50_ms'] - 1) * 100:>+12.1f}%"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Benchmark physics and rendering hot paths.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=200, help="timed samples per benchmark")
+    parser.add_argument("--gl", choices=("null", "real"), default="null", help="GL used by rendering benchmarks")
+    parser.add_argument("--save", help="write the results to this baseline JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before failing, 0.2 = 20%%")
+    parser.add_argument("--min-diff", type=float, default=0.01,
+                        help="smallest p50 slowdown per call in ms that can fail, however large relatively")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only or list(BENCHMARKS), args.repeat, args.gl)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "gl": args.gl,
+                       "repeat": args.repeat, "results": results}, f, indent=2)
+    if baseline:
+        regressions = compare(results, baseline, args.threshold, args.min_diff)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import math
+from collections import OrderedDict
+import numpy as np
+from trajectory import TIME_STEPS, compute_trajectory
+from physics import calculate_points
+
+
+class TrajectoryCache:
+    """Bounded LRU memo of computed trajectories.
+
+    Entries are evicted least-recently-used first once either maxsize entries
+    or max_bytes of array data are held. With speed_quantum / angle_quantum
+    set, the launch speed and angle are rounded to that step before lookup
+    *and* before computing, so shots that differ by less than it share one
+    entry. Every other parameter (gravity, restitution, dt, ...) is used as given.
+    """
+
+    def __init__(self, maxsize=256, max_bytes=64 * 1024 * 1024, speed_quantum=None, angle_quantum=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.speed_quantum = speed_quantum
+        self.angle_quantum = angle_quantum
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def quantize(self, speed, angle):
+        """The launch speed and angle rounded to their quanta."""
+        return _round(speed, self.speed_quantum), _round(angle, self.angle_quantum)
+
+    def get(self, key, compute):
+        """Return the entry for key, calling compute(*key) on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        value = compute(*key)
+        size = _freeze(value)
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while len(self._entries) > 1 and (len(self._entries) > self.maxsize or self.nbytes > self.max_bytes):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_size
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def _round(value, quantum):
+    value = float(value)
+    return round(value / quantum) * quantum if quantum else value
+
+
+def _freeze(value):
+    """Make every array in a cached value read-only and return their total size in bytes."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_freeze(v) for v in value)
+    return 0
+
+
+trajectory_cache = TrajectoryCache()
+points_cache = TrajectoryCache()
+
+
+def cached_trajectory(speed, angle, gravity, start_x=0, start_y=0, time_steps=TIME_STEPS, max_bounces=3, e=0.7,
+                      cache=trajectory_cache):
+    """compute_trajectory through the cache. The returned arrays are shared and read-only."""
+    key = (*cache.quantize(speed, angle), float(gravity), float(start_x), float(start_y),
+           time_steps, max_bounces, float(e))
+    return cache.get(key, compute_trajectory)
+
+
+def _compute_points(speed, angle, gravity, restitution, dt, start):
+    bounce_steps = []
+    points = []
+    v_x = speed * math.cos(angle)
+    v_y = speed * math.sin(angle)
+    for point in calculate_points(v_x, v_y, gravity, dt, list(start), restitution, [],
+                                  lambda: bounce_steps.append(len(points) + 1)):
+        points.append(tuple(point))
+    return np.array(points, dtype=np.float64).reshape(-1, 2), np.array(bounce_steps, dtype=np.int64)
+
+
+def cached_points(speed, angle, gravity, restitution, dt=0.01, start=(50, 50), cache=points_cache):
+    """Stepped calculate_points flight as (points, bounce_steps) arrays, through the cache.
+
+    bounce_steps holds the number of steps run once each ground hit has happened,
+    i.e. one past the index of the point produced by the step that hit; a value
+    of len(points) + 1 is the final bounce that stopped the flight.
+    """
+    key = (*cache.quantize(speed, angle), float(gravity), tuple(map(float, restitution)), float(dt),
+           tuple(map(float, start)))
+    return cache.get(key, _compute_points)
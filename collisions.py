@@ -0,0 +1,161 @@
+import numpy as np
+
+# Half of the 3x3 neighbourhood, so each pair of neighbouring cells is visited once
+NEIGHBOUR_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class SpatialHash:
+    """Uniform grid over 2D points, rebuilt from scratch with one argsort per step.
+
+    Points are bucketed by the integer cell they fall in; candidate pairs only
+    come from the same or neighbouring cells, so finding contacts is roughly
+    O(n) instead of checking all n^2 pairs.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.order = np.empty(0, np.int64)
+        self.sorted_keys = np.empty(0, np.int64)
+
+    @staticmethod
+    def key(ix, iy):
+        return (ix.astype(np.int64) << 32) + (iy.astype(np.int64) + 2**31)
+
+    def build(self, positions):
+        cells = np.floor(np.asarray(positions) / self.cell_size).astype(np.int64)
+        self.ix, self.iy = cells[:, 0], cells[:, 1]
+        keys = self.key(self.ix, self.iy)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def _expand(self, keys, owners):
+        """(owner, point) index pairs for every point whose cell key is in keys."""
+        lo = np.searchsorted(self.sorted_keys, keys, side="left")
+        hi = np.searchsorted(self.sorted_keys, keys, side="right")
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+        first = np.repeat(lo, counts)
+        offset = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(owners, counts), self.order[first + offset]
+
+    def candidate_pairs(self):
+        """All (i, j), i != j, of points in the same or adjacent cells, each pair once."""
+        pairs_i, pairs_j = [], []
+        owners = np.arange(len(self.order))
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            i, j = self._expand(self.key(self.ix + dx, self.iy + dy), owners)
+            if dx == 0 and dy == 0:
+                keep = i < j
+                i, j = i[keep], j[keep]
+            pairs_i.append(i)
+            pairs_j.append(j)
+        return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+    def query_box(self, x0, y0, x1, y1):
+        """Indices of points in cells overlapping the box."""
+        ix = np.arange(np.floor(x0 / self.cell_size), np.floor(x1 / self.cell_size) + 1).astype(np.int64)
+        iy = np.arange(np.floor(y0 / self.cell_size), np.floor(y1 / self.cell_size) + 1).astype(np.int64)
+        gx, gy = np.meshgrid(ix, iy)
+        keys = self.key(gx.ravel(), gy.ravel())
+        return self._expand(keys, np.zeros(len(keys), np.int64))[1]
+
+
+class Collider:
+    """Ball-ball and ball-obstacle contacts for ProjectileBatch.
+
+    radius is a number or one per ball, obstacles are (x0, y0, x1, y1)
+    rectangles. Contacts reuse the bounce rules of the ground: the velocity
+    along the contact normal is reversed and scaled by the y restitution and
+    the tangential part scaled by the x restitution (ball pairs use the mean
+    of the two balls' coefficients, with equal masses).
+    """
+
+    def __init__(self, radius=5.0, obstacles=(), cell_size=None):
+        self.radius = np.asarray(radius, dtype=np.float64)
+        self.obstacles = [tuple(map(float, box)) for box in obstacles]
+        self.hash = SpatialHash(cell_size or 2 * float(self.radius.max()))
+
+    def resolve(self, positions, velocities, restitution, active):
+        """Separate and bounce every touching ball, in place. Returns the number of contacts."""
+        index = np.flatnonzero(active)
+        if not len(index):
+            return 0
+        pos = positions[index]
+        vel = velocities[index]
+        rest = restitution[index]
+        radius = np.broadcast_to(self.radius, positions.shape[:1])[index]
+        self.hash.build(pos)
+
+        contacts = self._resolve_pairs(pos, vel, rest, radius)
+        for box in self.obstacles:
+            contacts += self._resolve_box(box, pos, vel, rest, radius)
+
+        positions[index] = pos
+        velocities[index] = vel
+        return contacts
+
+    def _resolve_pairs(self, pos, vel, rest, radius):
+        i, j = self.hash.candidate_pairs()
+        delta = pos[j] - pos[i]
+        distance = np.sqrt((delta**2).sum(axis=1))
+        reach = radius[i] + radius[j]
+        touching = (distance < reach) & (distance > 0)
+        i, j, delta, distance, reach = i[touching], j[touching], delta[touching], distance[touching], reach[touching]
+        if not len(i):
+            return 0
+
+        normal = delta / distance[:, None]
+        relative = vel[j] - vel[i]
+        closing = (relative * normal).sum(axis=1)
+        approaching = closing < 0
+        e = 0.5 * (rest[i] + rest[j])  # (x, y) restitution of each pair
+
+        normal_part = (closing * approaching)[:, None] * normal
+        tangent_part = (relative - closing[:, None] * normal) * approaching[:, None]
+        # Equal masses: each ball takes half of the change in relative velocity
+        change = 0.5 * ((1 + e[:, 1:2]) * normal_part + (1 - e[:, 0:1]) * tangent_part)
+        np.add.at(vel, i, change)
+        np.add.at(vel, j, -change)
+
+        push = 0.5 * (reach - distance)[:, None] * normal
+        np.add.at(pos, i, -push)
+        np.add.at(pos, j, push)
+        return len(i)
+
+    def _resolve_box(self, box, pos, vel, rest, radius):
+        x0, y0, x1, y1 = box
+        r = float(radius.max())
+        candidates = self.hash.query_box(x0 - r, y0 - r, x1 + r, y1 + r)
+        if not len(candidates):
+            return 0
+        c = pos[candidates]
+        closest = np.stack([np.clip(c[:, 0], x0, x1), np.clip(c[:, 1], y0, y1)], axis=-1)
+        delta = c - closest
+        distance = np.sqrt((delta**2).sum(axis=1))
+        inside = distance == 0
+        touching = (distance < radius[candidates]) | inside
+        if not touching.any():
+            return 0
+
+        # Centres inside the box leave through the nearest side
+        normal = np.zeros_like(delta)
+        normal[~inside] = delta[~inside] / distance[~inside, None]
+        if inside.any():
+            gaps = np.stack([c[inside, 0] - x0, x1 - c[inside, 0], c[inside, 1] - y0, y1 - c[inside, 1]], axis=-1)
+            side = gaps.argmin(axis=1)
+            normal[inside] = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)], np.float64)[side]
+            distance[inside] = -gaps[np.arange(len(side)), side]
+
+        k = candidates[touching]
+        normal = normal[touching]
+        v = vel[k]
+        along = (v * normal).sum(axis=1)
+        hitting = along < 0
+        normal_part = along[:, None] * normal
+        tangent = v - normal_part
+        bounced = tangent * rest[k, 0:1] - normal_part * rest[k, 1:2]
+        vel[k] = np.where(hitting[:, None], bounced, v)
+        pos[k] += (radius[k] - distance[touching])[:, None] * normal
+        return len(k)
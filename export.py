@@ -0,0 +1,93 @@
+import itertools
+import json
+import struct
+import sys
+import numpy as np
+
+# Binary stream layout, written front to back so it also works on pipes:
+#   header   magic, version, column count, then each column name as u2 length + ascii
+#   records  one little-endian float64 per column, until end of stream
+MAGIC = b"PEXP"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+NAME = struct.Struct("<H")
+CHUNK_SIZE = 4096
+
+
+def chunked(rows, columns, chunk_size=CHUNK_SIZE):
+    """Group a generator of row tuples into (n, columns) float64 arrays of at most chunk_size rows."""
+    rows = iter(rows)
+    width = len(columns)
+    while True:
+        flat = np.fromiter(itertools.chain.from_iterable(itertools.islice(rows, chunk_size)), np.float64)
+        if not len(flat):
+            return
+        yield flat.reshape(-1, width)
+
+
+def write_csv(chunks, out, columns, formats):
+    out.write(",".join(columns) + "\n")
+    line = ",".join(formats) + "\n"
+    for chunk in chunks:
+        out.write("".join(line % row for row in map(tuple, chunk.tolist())))
+
+
+def write_jsonl(chunks, out, columns, formats):
+    line = "{" + ", ".join(f"{json.dumps(name)}: {fmt}" for name, fmt in zip(columns, formats)) + "}\n"
+    for chunk in chunks:
+        out.write("".join(line % row for row in map(tuple, chunk.tolist())))
+
+
+def write_binary(chunks, out, columns, formats=None):
+    out.write(HEADER.pack(MAGIC, VERSION, len(columns)))
+    for name in columns:
+        encoded = name.encode("ascii")
+        out.write(NAME.pack(len(encoded)) + encoded)
+    for chunk in chunks:
+        out.write(np.ascontiguousarray(chunk, dtype="<f8").tobytes())
+
+
+WRITERS = {"csv": write_csv, "jsonl": write_jsonl, "binary": write_binary}
+
+
+def export(rows, out, columns, format="csv", formats=None, chunk_size=CHUNK_SIZE):
+    """Stream rows (tuples, one value per column) to out and return how many were written.
+
+    out is a path, "-" for stdout or an open file (binary mode for "binary").
+    Rows are pulled from the generator chunk_size at a time, so memory stays
+    bounded however long the trajectory is. formats are %-style formats per
+    column for the text formats, "%.6g" by default.
+    """
+    formats = formats or ("%.6g",) * len(columns)
+    count = [0]
+
+    def counted(chunks):
+        for chunk in chunks:
+            count[0] += len(chunk)
+            yield chunk
+
+    binary = format == "binary"
+    if out == "-":
+        out = sys.stdout.buffer if binary else sys.stdout
+    if isinstance(out, str):
+        with open(out, "wb" if binary else "w", newline="" if not binary else None) as f:
+            WRITERS[format](counted(chunked(rows, columns, chunk_size)), f, columns, formats)
+    else:
+        WRITERS[format](counted(chunked(rows, columns, chunk_size)), out, columns, formats)
+        out.flush()
+    return count[0]
+
+
+def read_binary(path):
+    """Load a file written by write_binary as a structured array with one field per column."""
+    with open(path, "rb") as f:
+        magic, version, width = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a binary export")
+        columns = []
+        for _ in range(width):
+            length, = NAME.unpack(f.read(NAME.size))
+            columns.append(f.read(length).decode("ascii"))
+        offset = f.tell()
+    dtype = np.dtype([(name, "<f8") for name in columns])
+    return np.fromfile(path, dtype, offset=offset)
@@ -0,0 +1,56 @@
+import numpy as np
+from physics import GROUND_LEVEL
+
+
+class Drag:
+    """Air drag per unit mass: a = -linear * v - quadratic * |v| * v, v relative to the wind.
+
+    Coefficients are numbers or (N,) arrays with one value per projectile.
+    """
+
+    def __init__(self, linear=0.0, quadratic=0.0):
+        self.linear = np.asarray(linear, dtype=np.float64)
+        self.quadratic = np.asarray(quadratic, dtype=np.float64)
+
+    def __call__(self, relative_velocity, mask=None):
+        k1 = self.linear if self.linear.ndim == 0 or mask is None else self.linear[mask]
+        k2 = self.quadratic if self.quadratic.ndim == 0 or mask is None else self.quadratic[mask]
+        speed = np.sqrt((relative_velocity**2).sum(axis=1))
+        return -(k1 + k2 * speed)[:, None] * relative_velocity
+
+
+class Wind:
+    """Wind velocity field evaluated for all projectiles at once.
+
+    velocity is the steady (x, y) wind, shear adds that much horizontal wind per
+    unit of height above the ground, and gust adds a horizontal
+    gust * sin(2 pi t / gust_period) that is the same everywhere.
+    """
+
+    def __init__(self, velocity=(0.0, 0.0), shear=0.0, gust=0.0, gust_period=5.0, ground=GROUND_LEVEL):
+        self.velocity = np.asarray(velocity, dtype=np.float64)
+        self.shear = shear
+        self.gust = gust
+        self.gust_period = gust_period
+        self.ground = ground
+
+    def __call__(self, positions, t):
+        wind = np.broadcast_to(self.velocity, positions.shape).copy()
+        if self.shear:
+            wind[:, 0] += self.shear * np.maximum(positions[:, 1] - self.ground, 0.0)
+        if self.gust:
+            wind[:, 0] += self.gust * np.sin(2 * np.pi * t / self.gust_period)
+        return wind
+
+
+def acceleration(g, drag=None, wind=None):
+    """acceleration(pos, vel, t) for gravity plus optional drag and wind, for the integrators."""
+    g = np.asarray(g, dtype=np.float64)
+
+    def accelerate(pos, vel, t):
+        a = np.zeros_like(vel)
+        a[:, 1] = -g
+        if drag is not None:
+            a += drag(vel - wind(pos, t) if wind is not None else vel)
+        return a
+    return accelerate
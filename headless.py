@@ -0,0 +1,128 @@
+"""Run the projectile physics without a window or audio device.
+
+    python -m headless run --speed 50 80 --angle 45 30
+    python -m headless run --mode points --speed 120 --angle 60 --output shot.csv
+    python -m headless run --speed 10 20 30 --angle 45 --store shots.traj
+    python -m headless run --speed 50 --angle 45 --format jsonl | consumer
+    python -m projectile run --headless --speed 50 --angle 45
+"""
+import argparse
+import math
+import sys
+import time
+import numpy as np
+from trajectory import TIME_STEPS, compute_trajectory
+from physics import calculate_points
+from store import write_store
+from export import export
+from batch import ProjectileBatch
+from forces import Drag, Wind
+
+
+def run_trajectory(speed, angle, gravity):
+    """Rows of (arc, t, x, y) from the bouncing model used by Projectile.calculate_trajectory."""
+    arcs, flight_times = compute_trajectory(speed, math.radians(angle), gravity)[:2]
+    for arc, (points, t_flight) in enumerate(zip(arcs, flight_times)):
+        dt = t_flight / TIME_STEPS
+        for i, (x, y) in enumerate(points.tolist()):
+            yield arc, i * dt, x, y
+
+
+def run_points(speed, angle, gravity, dt=0.01, start=(50, 50), restitution=(0.4, 0.7)):
+    """Rows of (bounces, t, x, y) from the stepped model used by MIprojectile.calculate_points."""
+    rad = math.radians(angle)
+    bounces = [0]
+
+    def on_bounce():
+        bounces[0] += 1
+
+    points = calculate_points(speed * math.cos(rad), speed * math.sin(rad), gravity, dt, list(start),
+                              restitution, [], on_bounce)
+    for step, (x, y) in enumerate(points, start=1):
+        yield bounces[0], step * dt, x, y
+
+
+def run_points_with_drag(speed, angle, gravity, drag, wind=None, dt=0.01, start=(50, 50), restitution=(0.4, 0.7)):
+    """Like run_points with air drag, stepping a one-projectile ProjectileBatch."""
+    batch = ProjectileBatch.from_launches([speed], [math.radians(angle)], start, gravity, restitution,
+                                          drag=drag, wind=wind)
+    bounces = 0
+    step = 0
+    while batch.active[0]:
+        bounced, _ = batch.step(dt)
+        bounces += int(bounced[0])
+        step += 1
+        if batch.active[0]:
+            yield bounces, step * dt, float(batch.positions[0, 0]), float(batch.positions[0, 1])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="headless", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="simulate launches and write the sampled points")
+    run.add_argument("--mode", choices=("trajectory", "points"), default="trajectory",
+                     help="trajectory: Projectile.py bouncing arcs, points: MIprojectile.py stepping")
+    run.add_argument("--speed", type=float, nargs="+", required=True, help="launch speeds (m/s)")
+    run.add_argument("--angle", type=float, nargs="+", required=True, help="launch angles (degrees)")
+    run.add_argument("--gravity", type=float, nargs="+", default=[9.81], help="gravity (m/s^2)")
+    run.add_argument("--dt", type=float, default=0.01, help="time step for --mode points")
+    run.add_argument("--restitution", type=float, nargs=2, default=(0.4, 0.7), metavar=("X", "Y"),
+                     help="bounce damping for --mode points")
+    run.add_argument("--drag-linear", type=float, default=0.0, help="linear drag for --mode points (1/s)")
+    run.add_argument("--drag-quadratic", type=float, default=0.0, help="quadratic drag for --mode points (1/m)")
+    run.add_argument("--wind", type=float, nargs=2, metavar=("VX", "VY"), help="steady wind for --mode points")
+    run.add_argument("--output", "-o", default="-", help="write to this file instead of stdout")
+    run.add_argument("--format", choices=("csv", "jsonl", "binary"), default="csv",
+                     help="output format, binary is the float64 record stream read by export.read_binary")
+    run.add_argument("--store", help="write the points of every launch to a binary trajectory store (see store.py)")
+    run.add_argument("--float64", action="store_true", help="store float64 instead of float32 points")
+    return parser
+
+
+def launches(args):
+    """Pair up speeds, angles and gravities, repeating a single value for every launch."""
+    count = max(len(args.speed), len(args.angle), len(args.gravity))
+    for values in (args.speed, args.angle, args.gravity):
+        if len(values) not in (1, count):
+            raise SystemExit("--speed, --angle and --gravity need one value or one per launch")
+    return [tuple(values[i if len(values) > 1 else 0] for values in (args.speed, args.angle, args.gravity))
+            for i in range(count)]
+
+
+def samples(args, speed, angle, gravity):
+    if args.mode == "trajectory":
+        return run_trajectory(speed, angle, gravity)
+    if args.drag_linear or args.drag_quadratic:
+        return run_points_with_drag(speed, angle, gravity, Drag(args.drag_linear, args.drag_quadratic),
+                                    Wind(args.wind) if args.wind else None, args.dt, restitution=args.restitution)
+    return run_points(speed, angle, gravity, args.dt, restitution=args.restitution)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.mode == "trajectory" and (args.drag_linear or args.drag_quadratic or args.wind):
+        parser.error("--drag-linear, --drag-quadratic and --wind need --mode points")
+    if args.wind and not (args.drag_linear or args.drag_quadratic):
+        parser.error("--wind only acts through drag, it needs --drag-linear or --drag-quadratic")
+    if args.store:
+        started = time.perf_counter()
+        count = write_store(args.store, (np.array([(x, y) for _, _, x, y in samples(args, *launch)]).reshape(-1, 2)
+                                         for launch in launches(args)),
+                            np.float64 if args.float64 else np.float32)
+        print(f"{count} trajectories in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+        return
+
+    def rows():
+        for number, launch in enumerate(launches(args), start=1):
+            for key, t, x, y in samples(args, *launch):
+                yield number, key, t, x, y
+
+    columns = ("projectile", "arc" if args.mode == "trajectory" else "bounces", "t", "x", "y")
+    started = time.perf_counter()
+    count = export(rows(), args.output, columns, args.format, ("%d", "%d", "%.6g", "%.6g", "%.6g"))
+    print(f"{count} samples in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Per-frame timing of the main loops.
+
+Every loop times its physics, draw, text, swap and poll phases with a
+FrameProfiler. Set PROFILE_OVERLAY=1 to show rolling percentiles on screen
+and PROFILE_TRACE=trace.json to write a Chrome trace (chrome://tracing or
+ui.perfetto.dev) when the loop ends.
+"""
+import json
+import os
+import sys
+import time
+from collections import deque
+import numpy as np
+
+PHASES = ("physics", "draw", "text", "swap", "poll")
+
+
+class _Phase:
+    """Context manager adding the time spent inside it to one phase of the current frame."""
+
+    __slots__ = ("profiler", "index", "name", "started")
+
+    def __init__(self, profiler, index, name):
+        self.profiler = profiler
+        self.index = index
+        self.name = name
+
+    def __enter__(self):
+        self.started = self.profiler.clock()
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        elapsed = profiler.clock() - self.started
+        profiler.current[self.index] += elapsed
+        if profiler.trace is not None:
+            profiler.trace.append((self.name, self.started, elapsed))
+
+
+class FrameProfiler:
+    """Ring of the last `capacity` frames' durations, split by phase.
+
+    Call begin_frame() and end_frame() around a frame and wrap its parts in
+    `with profiler.phase("draw"):`. Phases should not nest, the frame total
+    also counts whatever runs outside them. Recording costs two clock reads
+    per phase and writes into preallocated arrays, so it can stay on.
+    """
+
+    def __init__(self, capacity=600, overlay=False, trace_path=None, trace_capacity=100000,
+                 clock=time.perf_counter):
+        self.clock = clock
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, len(PHASES) + 1))  # seconds per phase, then the frame total
+        self.current = np.zeros(len(PHASES) + 1)
+        self.count = 0
+        self.next = 0
+        self.overlay = overlay
+        self.trace_path = trace_path
+        self.trace = deque(maxlen=trace_capacity) if trace_path else None  # (name, start, duration)
+        self.origin = clock()
+        self.frame_started = None
+        self._phases = {name: _Phase(self, i, name) for i, name in enumerate(PHASES)}
+
+    def phase(self, name):
+        return self._phases[name]
+
+    def begin_frame(self):
+        self.current[:] = 0.0
+        self.frame_started = self.clock()
+
+    def end_frame(self):
+        if self.frame_started is None:
+            return
+        elapsed = self.clock() - self.frame_started
+        self.current[-1] = elapsed
+        self.frames[self.next] = self.current
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        if self.trace is not None:
+            self.trace.append(("frame", self.frame_started, elapsed))
+        self.frame_started = None
+
+    def percentiles(self, ps=(50, 95, 99)):
+        """{phase or "frame": [milliseconds at each percentile]} over the recorded frames."""
+        if not self.count:
+            return {}
+        values = np.percentile(self.frames[:self.count], ps, axis=0) * 1e3
+        return {name: values[:, i].tolist() for i, name in enumerate(PHASES + ("frame",))}
+
+    def lines(self):
+        return [f"{name:<8}{p50:6.2f}{p95:6.2f}{p99:6.2f} ms" for name, (p50, p95, p99) in self.percentiles().items()]
+
+    def draw_overlay(self, font_size=16, color=(1.0, 1.0, 0.3)):
+        """Draw the percentile table in the top right corner of the window, if the overlay is on."""
+        if not self.overlay or not self.count:
+            return
+        from OpenGL.GL import glGetIntegerv, GL_VIEWPORT
+        from text import get_atlas
+        atlas = get_atlas(font_size)
+        _, _, width, height = glGetIntegerv(GL_VIEWPORT)
+        lines = ["phase     p50   p95   p99"] + self.lines()
+        x = width - max(atlas.width(line) for line in lines) - 10
+        atlas.draw([(line, x, height - (i + 1) * atlas.height - 5) for i, line in enumerate(lines)], color)
+
+    def dump_trace(self, path=None):
+        """Write the recorded phases and frames as Chrome trace event JSON."""
+        path = path or self.trace_path
+        events = [{"name": name, "cat": "frame" if name == "frame" else "phase", "ph": "X", "pid": 1,
+                   "tid": 1 if name == "frame" else 2, "ts": (start - self.origin) * 1e6, "dur": duration * 1e6}
+                  for name, start, duration in self.trace or ()]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def finish(self):
+        """Write the trace, if one was asked for, and the percentile table to stderr."""
+        if self.trace_path:
+            self.dump_trace()
+        if self.overlay or self.trace_path:
+            print("phase     p50   p95   p99", *self.lines(), sep="\n", file=sys.stderr)
+
+
+def frame_profiler():
+    """A FrameProfiler configured from PROFILE_OVERLAY and PROFILE_TRACE."""
+    return FrameProfiler(overlay=os.environ.get("PROFILE_OVERLAY", "") not in ("", "0"),
+                         trace_path=os.environ.get("PROFILE_TRACE") or None)
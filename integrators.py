@@ -0,0 +1,110 @@
+"""Time integration schemes for batched projectile state.
+
+Every scheme takes (N, 2) position and velocity arrays, the time t, the step dt
+and acceleration(positions, velocities, t) -> (N, 2), and returns the new
+(positions, velocities). Run this module to benchmark them:
+
+    python -m integrators --count 10000 --dt 0.001 0.01 0.05 0.1
+"""
+import argparse
+import time
+import numpy as np
+
+
+def euler(pos, vel, t, dt, acceleration):
+    """Explicit Euler, the scheme calculate_points uses: position moves with the old velocity."""
+    return pos + vel * dt, vel + acceleration(pos, vel, t) * dt
+
+
+def semi_implicit_euler(pos, vel, t, dt, acceleration):
+    """Symplectic Euler: update the velocity first and move with the new one."""
+    vel = vel + acceleration(pos, vel, t) * dt
+    return pos + vel * dt, vel
+
+
+def verlet(pos, vel, t, dt, acceleration):
+    """Velocity Verlet, exact for constant acceleration at one extra evaluation per step."""
+    a0 = acceleration(pos, vel, t)
+    new_pos = pos + vel * dt + 0.5 * a0 * dt**2
+    a1 = acceleration(new_pos, vel + a0 * dt, t + dt)
+    return new_pos, vel + 0.5 * (a0 + a1) * dt
+
+
+def rk4(pos, vel, t, dt, acceleration):
+    """Classic fourth order Runge-Kutta."""
+    half = 0.5 * dt
+    k1v = acceleration(pos, vel, t)
+    k1x = vel
+    k2v = acceleration(pos + k1x * half, vel + k1v * half, t + half)
+    k2x = vel + k1v * half
+    k3v = acceleration(pos + k2x * half, vel + k2v * half, t + half)
+    k3x = vel + k2v * half
+    k4v = acceleration(pos + k3x * dt, vel + k3v * dt, t + dt)
+    k4x = vel + k3v * dt
+    return (pos + (k1x + 2 * k2x + 2 * k3x + k4x) * (dt / 6),
+            vel + (k1v + 2 * k2v + 2 * k3v + k4v) * (dt / 6))
+
+
+INTEGRATORS = {
+    "euler": euler,
+    "semi_implicit_euler": semi_implicit_euler,
+    "verlet": verlet,
+    "rk4": rk4,
+}
+
+
+def gravity(g):
+    """Acceleration function for gravity alone, g a number or an (N,) array."""
+    g = np.asarray(g, dtype=np.float64)
+
+    def acceleration(pos, vel, t):
+        a = np.zeros_like(vel)
+        a[:, 1] = -g
+        return a
+    return acceleration
+
+
+def benchmark(count=10000, dts=(0.001, 0.01, 0.05, 0.1), duration=5.0, g=9.81, seed=0):
+    """Fly `count` projectiles for `duration` seconds (rounded to whole steps) with every scheme and dt.
+
+    Returns rows of (scheme, dt, steps per second, projectile-steps per second,
+    max position error against the exact parabola).
+    """
+    rng = np.random.default_rng(seed)
+    speed = rng.uniform(10, 300, count)
+    angle = rng.uniform(0.1, 1.4, count)
+    vel0 = np.stack([speed * np.cos(angle), speed * np.sin(angle)], axis=-1)
+    pos0 = np.zeros_like(vel0)
+    acceleration = gravity(g)
+
+    rows = []
+    for name, step in INTEGRATORS.items():
+        for dt in dts:
+            steps = int(round(duration / dt))
+            t = steps * dt  # the time actually simulated, duration rounded to whole steps
+            exact = pos0 + vel0 * t
+            exact[:, 1] -= 0.5 * g * t**2
+            pos, vel = pos0.copy(), vel0.copy()
+            started = time.perf_counter()
+            for i in range(steps):
+                pos, vel = step(pos, vel, i * dt, dt, acceleration)
+            elapsed = time.perf_counter() - started
+            error = float(np.abs(pos - exact).max())
+            rows.append((name, dt, steps / elapsed, steps * count / elapsed, error))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="integrators", description="Benchmark the integration schemes.")
+    parser.add_argument("--count", type=int, default=10000, help="projectiles per batch")
+    parser.add_argument("--dt", type=float, nargs="+", default=[0.001, 0.01, 0.05, 0.1])
+    parser.add_argument("--duration", type=float, default=5.0, help="simulated seconds")
+    args = parser.parse_args(argv)
+
+    print(f"{'scheme':<20}{'dt':>8}{'steps/s':>12}{'body-steps/s':>15}{'max error':>12}")
+    for name, dt, steps_per_second, body_steps, error in benchmark(args.count, args.dt, args.duration):
+        print(f"{name:<20}{dt:>8g}{steps_per_second:>12.0f}{body_steps:>15.3g}{error:>12.3g}")
+
+
+if __name__ == "__main__":
+    main()
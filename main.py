@@ -1,48 +1,96 @@
 import time
+started = time.perf_counter()  # for the startup report, before the slow imports
+import importlib
 import glfw
 from OpenGL.GL import *
 from start_function import draw_start_screen, handle_start_screen_click
 from exit_function import exit_program
-from Projectile import main as projectile_simulation  # Import Projectile.py's main function
 from utils import init_window
-from MIprojectile import main as mi_projectile
+from scenes import SceneManager
+from startup import Preloader, StartupReport
 
 # Window settings
 window_width, window_height = 900, 800
-current_state = "start"
-
-def mouse_button_callback(window, button, action, mods):
-    """Handles mouse button interactions."""
-    global current_state
-    xpos, ypos = glfw.get_cursor_pos(window)
-    
-    if current_state == "start":
-        current_state = handle_start_screen_click(xpos, ypos, window, current_state)
-        if current_state == "projectile":
-            glfw.destroy_window(window)  # Close menu window before opening simulation
-            projectile_simulation()  # Start the projectile simulation
-            # mi_projectile()
-        if current_state == "mi_projectile":
-            glfw.destroy_window(window)
-            mi_projectile()
-def main():
-    global current_state
+report = StartupReport(started)
+preloader = None  # loads the scenes, font and sound behind the menu, started by main()
 
-    window = init_window(window_width, window_height, "Projectile Motion Simulation")
-    glfw.set_mouse_button_callback(window, mouse_button_callback)
+class MenuScene:
+    """The start menu, every simulation is a scene of the same window."""
+
+    width, height = window_width, window_height
+
+    def __init__(self):
+        self.next = None
+        self.frames = 0
+        self.reported = False
+
+    def enter(self):
+        self.next = None
+
+    def frame(self, profiler):
+        with profiler.phase("draw"):
+            glClear(GL_COLOR_BUFFER_BIT)
+            glLoadIdentity()
+            draw_start_screen(preloader.ready("font"))  # buttons right away, labels once the font is in
+        return self.next
 
-    while not glfw.window_should_close(window):
-        glClear(GL_COLOR_BUFFER_BIT)
-        glLoadIdentity()
+    def shown(self):
+        """Called after the swap, so "menu shown" is when the first frame is on screen."""
+        self.frames += 1
+        if self.frames == 1:
+            report.mark("menu shown")
+        if not self.reported and all(preloader.ready(name) for name in preloader.tasks):
+            report.print()  # once everything behind the menu is loaded too
+            self.reported = True
 
-        if current_state == "start":
-            draw_start_screen()
+    def on_mouse_button(self, window, button, action, mods):
+        """Handles mouse button interactions."""
+        if button == glfw.MOUSE_BUTTON_LEFT and action == glfw.PRESS:
+            xpos, ypos = glfw.get_cursor_pos(window)
+            state = handle_start_screen_click(xpos, ypos, window, "start")
+            if state != "start":
+                self.next = state  # switched to after this frame
 
-        glfw.swap_buffers(window)
-        glfw.poll_events()
-        time.sleep(0.01)
+    def leave(self):
+        pass
+
+    def delete(self):
+        pass
+
+def preload_tasks():
+    """What the menu does not need, in the order the preload thread loads it."""
+    from text import rasterize
+    from audio import open_audio
+    return [
+        ("font", lambda: rasterize(36)),  # the menu's own button labels first
+        ("Projectile", lambda: importlib.import_module("Projectile")),
+        ("MIprojectile", lambda: importlib.import_module("MIprojectile")),
+        ("advProjectile", lambda: importlib.import_module("advProjectile")),
+        ("sound", lambda: open_audio("bounce.wav")),
+    ]
+
+def main():
+    global preloader
+
+    report.mark("imports")
+    preloader = Preloader(preload_tasks(), report)
+    window = init_window(window_width, window_height, "Projectile Motion Simulation")
+    glfw.swap_interval(1)  # vsync paces the frames instead of sleeping
+    report.mark("window")
 
-    exit_program(window)
+    # Scenes are imported on first use (see preload_tasks) and kept with their GPU resources
+    manager = SceneManager(window, {
+        "start": MenuScene,
+        "projectile": lambda: preloader.result("Projectile").MultiProjectileScene(),
+        "mi_projectile": lambda: preloader.result("MIprojectile").InteractiveScene(),
+        "bouncing": lambda: preloader.result("advProjectile").BouncingScene(),
+    }, home="start")
+    try:
+        manager.run("start")
+    finally:
+        manager.close()
+        exit_program(window)
+        glfw.terminate()
 
 if __name__ == "__main__":
     main()
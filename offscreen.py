@@ -0,0 +1,370 @@
+"""Render the simulations into an offscreen framebuffer at a fixed frame rate.
+
+    python -m offscreen projectile --speed 50 80 --angle 45 30 --png frames/
+    python -m offscreen mi --speed 120 --angle 40 --raw - | ffmpeg -f rawvideo -pix_fmt rgba -s 900x800 -r 60 -i - shot.mp4
+    python -m offscreen adv --raw bounce.rgba
+
+Frames are drawn at t = frame / fps of simulated time with no waiting, into a
+framebuffer object of a hidden window. Pixels come back through a ring of
+pixel buffer objects: the read of frame n is only mapped once frame n + 1 has
+been queued, so the GPU copy overlaps drawing instead of stalling it.
+"""
+import argparse
+import ctypes
+import math
+import os
+import random
+import sys
+import time
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.raw.GL.VERSION.GL_1_0 import glReadPixels as read_pixels_into
+from playback import PlaybackSet
+
+
+class Framebuffer:
+    """Framebuffer object with an RGBA8 color renderbuffer, the render target instead of the window."""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.renderbuffer = glGenRenderbuffers(1)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.renderbuffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        self.framebuffer = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.renderbuffer)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.delete()
+            raise RuntimeError(f"framebuffer incomplete: 0x{status:x}")
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.framebuffer)
+        glViewport(0, 0, self.width, self.height)
+
+    def delete(self):
+        if self.framebuffer:
+            glDeleteFramebuffers(1, [self.framebuffer])
+            glDeleteRenderbuffers(1, [self.renderbuffer])
+            self.framebuffer = self.renderbuffer = 0
+
+
+class PixelReader:
+    """Asynchronous glReadPixels through a ring of pixel buffer objects.
+
+    read() queues a copy of the bound framebuffer into the next buffer and
+    returns the oldest queued frame once the ring is full (None before that),
+    as an (height, width, 4) uint8 array with the top row first.
+    """
+
+    def __init__(self, width, height, buffers=2):
+        self.width, self.height = width, height
+        self.size = width * height * 4
+        self.buffers = list(glGenBuffers(buffers)) if buffers > 1 else [glGenBuffers(1)]
+        for buffer in self.buffers:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, buffer)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.size, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.queued = 0  # frames copied but not yet returned
+        self.next = 0
+
+    def read(self):
+        frame = self._map(self.next) if self.queued == len(self.buffers) else None
+        if frame is not None:
+            self.queued -= 1
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[self.next])
+        read_pixels_into(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.next = (self.next + 1) % len(self.buffers)
+        self.queued += 1
+        return frame
+
+    def flush(self):
+        """The frames still in flight, oldest first."""
+        while self.queued:
+            first = (self.next - self.queued) % len(self.buffers)
+            self.queued -= 1
+            yield self._map(first)
+
+    def _map(self, i):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self.buffers[i])
+        address = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        pixels = np.ctypeslib.as_array((ctypes.c_ubyte * self.size).from_address(address))
+        frame = pixels.reshape(self.height, self.width, 4)[::-1].copy()  # GL rows start at the bottom
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        return frame
+
+    def delete(self):
+        if self.buffers:
+            glDeleteBuffers(len(self.buffers), self.buffers)
+            self.buffers = []
+
+
+class PngSequence:
+    """Writes each frame to directory/frame_000000.png."""
+
+    def __init__(self, directory, prefix="frame"):
+        import pygame
+        self.pygame = pygame
+        self.pattern = os.path.join(directory, prefix + "_{:06d}.png")
+        os.makedirs(directory, exist_ok=True)
+        self.count = 0
+
+    def __call__(self, frame):
+        height, width = frame.shape[:2]
+        surface = self.pygame.image.frombuffer(frame.tobytes(), (width, height), "RGBA")
+        self.pygame.image.save(surface, self.pattern.format(self.count))
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class RawVideo:
+    """Appends frames as packed RGBA bytes to a file, or stdout for "-" (e.g. piped into ffmpeg)."""
+
+    def __init__(self, path):
+        self.out = sys.stdout.buffer if path == "-" else open(path, "wb")
+        self.count = 0
+
+    def __call__(self, frame):
+        self.out.write(frame.tobytes())
+        self.count += 1
+
+    def close(self):
+        self.out.flush()
+        if self.out is not sys.stdout.buffer:
+            self.out.close()
+
+
+def set_projection(width, height):
+    glMatrixMode(GL_PROJECTION)
+    glLoadIdentity()
+    glOrtho(0, width, 0, height, -1, 1)
+    glMatrixMode(GL_MODELVIEW)
+    glLoadIdentity()
+
+
+class ProjectileScene:
+    """Projectile.main after the launch click: every arc drawn, the balls replayed at simulated time t."""
+
+    def __init__(self, launches, seed=0):
+        import Projectile
+        self.scene = Projectile
+        self.width, self.height = Projectile.WIDTH, Projectile.HEIGHT
+        self.launches = launches  # (speed, angle in degrees, gravity)
+        self.seed = seed
+
+    def setup(self):
+        rng = random.Random(self.seed)
+        self.trajectories = []
+        self.buffers = []
+        self.colors = []
+        for i, (speed, angle, gravity) in enumerate(self.launches, start=1):
+            trajectory_bounces, speed, angle, start_x, start_y, bounce_times = self.scene.calculate_trajectory(
+                speed, math.radians(angle), gravity, projectile_number=i, as_arrays=True)
+            self.trajectories.append((trajectory_bounces, speed, angle, start_x, start_y))
+            self.buffers.append(self.scene.upload_trajectory(trajectory_bounces))
+            self.colors.append((rng.random(), rng.random(), rng.random()))
+        self.playback = PlaybackSet([trajectory_bounces for trajectory_bounces, *_ in self.trajectories], scale=1 / 4)
+
+    def draw(self, t):
+        set_projection(self.width / 4, self.height / 4)  # Projectile.main's enlarged scale
+        glClear(GL_COLOR_BUFFER_BIT)
+        self.scene.draw_axes()
+        ball_positions, ball_colors, reports = self.scene.frame_positions(self.playback, self.trajectories, self.colors, t)
+        for trajectory, color in zip(self.buffers, self.colors):
+            self.scene.draw_trajectory(trajectory, color)
+        self.scene.draw_balls(ball_positions, 3, ball_colors, segments=40)
+        for speed, angle in reports:
+            self.scene.display_report(speed, angle, t)
+        return len(ball_positions) > 0
+
+    def delete(self):
+        for trajectory in self.buffers:
+            trajectory.delete()
+
+
+class ShotScene:
+    """One MIprojectile launch, replayed from the cached flight at MIprojectile's time scale."""
+
+    def __init__(self, velocity, angle, g=9.81, dt=0.01, restitution=(0.4, 0.7)):
+        import MIprojectile
+        self.scene = MIprojectile
+        self.width, self.height = MIprojectile.window_width, MIprojectile.window_height
+        self.shot = (velocity, angle, g, restitution, dt)
+
+    def setup(self):
+        from cache import cached_points
+        from render import TrailVBO
+        from timestep import FixedTimestep
+        velocity, angle, g, restitution, dt = self.shot
+        self.points = cached_points(velocity, angle, g, restitution, dt, self.scene.start_point)[0].tolist()
+        self.trail = TrailVBO(500)
+        self.now = 0.0
+        self.clock = FixedTimestep(dt, self.scene.time_scale, max_steps=1 << 30, clock=lambda: self.now)
+        self.step = 0
+        self.previous = self.current = list(self.scene.start_point)
+
+    def draw(self, t):
+        from timestep import interpolate
+        self.now = t
+        for _ in range(self.clock.advance()):
+            if self.step == len(self.points):
+                break
+            self.previous, self.current = self.current, self.points[self.step]
+            self.trail.append(self.current)
+            self.step += 1
+        set_projection(self.width, self.height)
+        glClear(GL_COLOR_BUFFER_BIT)
+        self.scene.draw_ground(self.width, self.height)
+        self.scene.draw_trail(self.trail)
+        glColor3f(1, 0.25, 0.45)
+        self.scene.simulate_projectile_motion(interpolate(self.previous, self.current, self.clock.alpha))
+        return self.step < len(self.points)
+
+    def delete(self):
+        self.trail.delete()
+
+
+class BounceScene:
+    """advProjectile.main's bouncing ball with its trail, stepped at one dt per simulated dt."""
+
+    def __init__(self, velocity=100, angle=65, g=9.81, dt=0.01, restitution=0.7, width=900, height=800):
+        import advProjectile
+        self.scene = advProjectile
+        self.width, self.height = width, height
+        self.shot = (velocity, angle, g, dt, restitution)
+
+    def setup(self):
+        from render import TrailVBO
+        from timestep import FixedTimestep
+        velocity, angle, g, dt, restitution = self.shot
+        rad = math.radians(angle)
+        self.points = self.scene.calculatePoints(velocity * math.cos(rad), velocity * math.sin(rad), g, dt, [10, 10],
+                                                 restitution)
+        self.trail = TrailVBO(500)
+        self.now = 0.0
+        self.clock = FixedTimestep(dt, max_steps=1 << 30, clock=lambda: self.now)
+        self.previous = self.current = [10, 10]
+        self.finished = False
+
+    def draw(self, t):
+        from timestep import interpolate
+        self.now = t
+        for _ in range(self.clock.advance()):
+            try:
+                point, v_y = next(self.points)
+            except StopIteration:
+                self.finished = True
+                break
+            self.previous, self.current = self.current, list(point)
+            self.trail.append(self.current)
+        set_projection(self.width, self.height)
+        glClear(GL_COLOR_BUFFER_BIT)
+        self.scene.draw_ground(self.width, self.height)
+        self.scene.draw_trail(self.trail)
+        point = interpolate(self.previous, self.current, self.clock.alpha)
+        color = (1.0 - point[1] / self.height, 0.2, point[1] / self.height)
+        self.scene.draw_circle(point, 8, 20, color)
+        return not self.finished
+
+    def delete(self):
+        self.trail.delete()
+
+
+def render(scene, write, fps=60, max_frames=None, buffers=2):
+    """Draw scene frames at t = frame / fps until it ends (or max_frames) and pass each to write.
+
+    Needs a current GL context, returns the number of frames written.
+    """
+    framebuffer = Framebuffer(scene.width, scene.height)
+    reader = PixelReader(scene.width, scene.height, buffers)
+    framebuffer.bind()
+    scene.setup()
+    frames = 0
+    try:
+        running = True
+        while running and (max_frames is None or frames < max_frames):
+            running = scene.draw(frames / fps)
+            frames += 1
+            frame = reader.read()
+            if frame is not None:
+                write(frame)
+        for frame in reader.flush():
+            write(frame)
+    finally:
+        scene.delete()
+        reader.delete()
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        framebuffer.delete()
+    return frames
+
+
+def hidden_window(width=64, height=64):
+    """A GL context from an invisible GLFW window, only used for its context."""
+    import glfw
+    if not glfw.init():
+        raise RuntimeError("GLFW initialization failed")
+    glfw.window_hint(glfw.VISIBLE, glfw.FALSE)
+    window = glfw.create_window(width, height, "offscreen", None, None)
+    if not window:
+        glfw.terminate()
+        raise RuntimeError("GLFW window creation failed")
+    glfw.make_context_current(window)
+    return window
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="offscreen", description=__doc__.splitlines()[0])
+    parser.add_argument("scene", choices=("projectile", "mi", "adv"))
+    parser.add_argument("--speed", type=float, nargs="+", help="launch speeds (default: the scene's own)")
+    parser.add_argument("--angle", type=float, nargs="+", help="launch angles in degrees")
+    parser.add_argument("--gravity", type=float, default=9.81)
+    parser.add_argument("--fps", type=float, default=60.0, help="simulated frames per second")
+    parser.add_argument("--max-frames", type=int)
+    parser.add_argument("--seed", type=int, default=0, help="color seed for the projectile scene")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--png", metavar="DIR", help="write a PNG sequence to this directory")
+    output.add_argument("--raw", metavar="FILE", help="write raw RGBA frames to this file, - for stdout")
+    args = parser.parse_args(argv)
+
+    speeds = args.speed or [100.0]
+    angles = args.angle or [65.0]
+    if args.scene == "projectile":
+        count = max(len(speeds), len(angles))
+        scene = ProjectileScene([(speeds[i % len(speeds)], angles[i % len(angles)], args.gravity) for i in range(count)],
+                                args.seed)
+    elif args.scene == "mi":
+        scene = ShotScene(speeds[0], math.radians(angles[0]), args.gravity)
+    else:
+        scene = BounceScene(speeds[0], angles[0], args.gravity)
+
+    write = PngSequence(args.png) if args.png else RawVideo(args.raw)
+    window = hidden_window()
+    started = time.perf_counter()
+    try:
+        # the scenes print their reports, keep stdout clean for a raw stream
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        try:
+            frames = render(scene, write, args.fps, args.max_frames)
+        finally:
+            sys.stdout = stdout
+        write.close()
+    finally:
+        import glfw
+        from text import delete_atlases
+        delete_atlases()  # the scenes' report text, while the context is still current
+        glfw.destroy_window(window)
+        glfw.terminate()
+    elapsed = time.perf_counter() - started
+    print(f"{frames} frames ({frames / args.fps:.2f}s simulated) in {elapsed:.2f}s, "
+          f"{frames / elapsed:.1f} fps, {scene.width}x{scene.height}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
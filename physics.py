@@ -0,0 +1,36 @@
+# Simulation rules shared by calculate_points and the batched/analytic solvers
+GROUND_LEVEL = 10  # y coordinate of the ground surface
+X_MIN, X_MAX = -40, 1000  # projectiles leaving this horizontal range are dropped
+Y_MAX = 1500  # ... as are projectiles flying above this height
+STOP_VX, STOP_VY = 1, 10  # a bounce slower than this in both axes ends the flight
+
+
+def restitution_pair(restitution):
+    """Return restitution as an (x, y) pair.
+
+    A single number (as used by advProjectile) only damps the vertical velocity.
+    """
+    if isinstance(restitution, (int, float)):
+        return (1.0, float(restitution))
+    return (float(restitution[0]), float(restitution[1]))
+
+
+def calculate_points(v_x, v_y, g, dt, point, restitution, trail, on_bounce=None):
+    """Step a projectile with explicit Euler, calling on_bounce() on every ground hit."""
+    while point[1] >= 0:
+        point[0] += v_x * dt
+        point[1] += v_y * dt
+        v_y -= g * dt
+        if point[1] <= GROUND_LEVEL:  # Ground level
+            point[1] = GROUND_LEVEL  # Reset to ground level
+            if on_bounce is not None:
+                on_bounce()
+            v_y = -v_y * restitution[1]
+            v_x = v_x* restitution[0]   # Reverse velocity with damping
+            if abs(v_y) < STOP_VY and abs(v_x) < STOP_VX:  # Stop bouncing when energy is negligible
+                trail.clear() # Deleting the trail after the position of the projectile is reset to initial point
+                break
+        if point[0] > X_MAX or point[0] < X_MIN or point[1] > Y_MAX:
+            trail.clear()
+            break
+        yield point
@@ -0,0 +1,145 @@
+import time
+import numpy as np
+from trajectory import TIME_STEPS
+
+
+class PlaybackIndex:
+    """Time-to-position lookup for one projectile's bounce arcs.
+
+    arcs is the [(points, t_flight), ...] list from calculate_trajectory with
+    as_arrays=True, each arc sampled time_steps times over t_flight (and cut
+    short by a sample when the last one fell below ground). The samples of
+    every arc are concatenated into one array and each arc's start time kept
+    in a sorted array, so position(t) is one binary search plus a linear
+    interpolation between two samples, whatever the number of arcs.
+    """
+
+    def __init__(self, arcs, scale=1.0, time_steps=TIME_STEPS):
+        arcs = [(np.asarray(points, dtype=np.float64).reshape(-1, 2), float(t_flight))
+                for points, t_flight in arcs if len(points)]
+        self.points = np.concatenate([points for points, t_flight in arcs]) * scale if arcs else np.zeros((0, 2))
+        self.durations = np.array([t_flight for points, t_flight in arcs])
+        self.starts = np.concatenate([[0.0], np.cumsum(self.durations)[:-1]]) if arcs else np.zeros(0)
+        self.spacings = self.durations / time_steps  # time between two samples of each arc
+        self.lengths = np.array([len(points) for points, t_flight in arcs], np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.lengths)[:-1]]).astype(np.int64) if arcs else np.zeros(0, np.int64)
+        self.end_time = float(self.durations.sum())
+
+    def arc_index(self, t):
+        """Arc in flight at time t (clamped to the first and last arc)."""
+        return np.clip(np.searchsorted(self.starts, t, side="right") - 1, 0, len(self.starts) - 1)
+
+    def position(self, t):
+        """Interpolated (x, y) at time t, or None outside [0, end_time]."""
+        if not len(self.points) or t < 0 or t > self.end_time:
+            return None
+        return self.positions(np.array([t], np.float64))[0]
+
+    def positions(self, t):
+        """(len(t), 2) positions at an array of times, clamped to the start and the end."""
+        t = np.clip(np.asarray(t, dtype=np.float64), 0.0, self.end_time)
+        arc = self.arc_index(t)
+        return _interpolate(self.points, t - self.starts[arc], self.spacings[arc], self.offsets[arc], self.lengths[arc])
+
+
+class PlaybackSet:
+    """PlaybackIndex for many projectiles, positions(t) returns all of them at once.
+
+    Arc start times, sample spacings and offsets are kept in (projectiles, arcs)
+    arrays padded with inf, so the arc of every projectile is found with one
+    vectorized comparison and all positions interpolated in one pass.
+    """
+
+    def __init__(self, trajectories, scale=1.0, time_steps=TIME_STEPS):
+        indexes = [PlaybackIndex(arcs, scale, time_steps) for arcs in trajectories]
+        width = max([len(index.starts) for index in indexes] + [1])
+        count = len(indexes)
+        self.starts = np.full((count, width), np.inf)
+        self.spacings = np.ones((count, width))
+        self.offsets = np.zeros((count, width), np.int64)
+        self.lengths = np.ones((count, width), np.int64)
+        base = 0
+        for i, index in enumerate(indexes):
+            n = len(index.starts)
+            self.starts[i, :n] = index.starts
+            self.spacings[i, :n] = index.spacings
+            self.offsets[i, :n] = index.offsets + base
+            self.lengths[i, :n] = index.lengths
+            base += len(index.points)
+        self.points = np.concatenate([index.points for index in indexes]) if indexes else np.zeros((0, 2))
+        self.end_times = np.array([index.end_time for index in indexes])
+        self.has_points = np.array([len(index.points) > 0 for index in indexes], bool)
+        self.end_time = float(self.end_times.max()) if count else 0.0
+
+    def __len__(self):
+        return len(self.end_times)
+
+    def positions(self, t):
+        """((N, 2) positions, (N,) in-flight mask) of every projectile at time t.
+
+        Projectiles that have not started or already finished are clamped to
+        their first or last sample and left out of the mask.
+        """
+        count = len(self.end_times)
+        if not count or not len(self.points):
+            return np.zeros((count, 2)), np.zeros(count, bool)
+        active = (t >= 0) & (t <= self.end_times) & self.has_points
+        local = np.clip(t, 0.0, self.end_times)
+        arc = np.maximum((self.starts <= local[:, None]).sum(axis=1) - 1, 0)
+        rows = np.arange(count)
+        positions = _interpolate(self.points, local - self.starts[rows, arc], self.spacings[rows, arc],
+                                 self.offsets[rows, arc], self.lengths[rows, arc])
+        return positions, active
+
+
+def _interpolate(points, local_t, spacing, offset, length):
+    """Positions local_t into arcs whose samples are points[offset:offset + length], spacing apart in time."""
+    u = np.clip(local_t / spacing, 0.0, length - 1)
+    i = np.minimum(np.floor(u).astype(np.int64), np.maximum(length - 2, 0))
+    fraction = (u - i)[:, None]
+    a = points[offset + i]
+    b = points[offset + np.minimum(i + 1, length - 1)]
+    return a + (b - a) * fraction
+
+
+class PlaybackClock:
+    """Playback time that can be paused, sped up, slowed down and moved to any point.
+
+    time() is position + speed * (wall time since the last change). Every
+    seek bumps `seeks`, so listeners such as an AudioTimeline can tell a jump
+    from normal playback and resynchronize.
+    """
+
+    def __init__(self, speed=1.0, clock=time.perf_counter):
+        self.clock = clock
+        self.speed = speed
+        self.paused = False
+        self.seeks = 0
+        self._origin = clock()
+        self._position = 0.0
+
+    def time(self):
+        if self.paused:
+            return self._position
+        return self._position + self.speed * (self.clock() - self._origin)
+
+    def _rebase(self):
+        self._position = self.time()
+        self._origin = self.clock()
+
+    def seek(self, t):
+        self._position = max(float(t), 0.0)
+        self._origin = self.clock()
+        self.seeks += 1
+
+    def scrub(self, delta):
+        """Seek relative to the current time."""
+        self.seek(self.time() + delta)
+
+    def set_speed(self, speed):
+        self._rebase()
+        self.speed = speed
+
+    def toggle_pause(self):
+        self._rebase()
+        self.paused = not self.paused
@@ -0,0 +1,110 @@
+import ctypes
+import functools
+import numpy as np
+from OpenGL.GL import *
+from trail import RingTrail
+
+
+class TrajectoryVBO:
+    """A static line strip uploaded to the GPU once and drawn with a single glDrawArrays."""
+
+    def __init__(self, points):
+        vertices = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 2)
+        self.count = len(vertices)
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def draw(self, mode=GL_LINE_STRIP, first=0, count=None):
+        count = self.count - first if count is None else count
+        if count > 0:
+            draw_buffer(self.buffer, mode, first, count)
+
+    def delete(self):
+        if self.buffer:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = 0
+
+
+class TrailVBO(RingTrail):
+    """RingTrail mirrored into a vertex buffer object.
+
+    Appends only touch the CPU ring, the whole ring is re-uploaded with one
+    glBufferSubData when it is drawn after changing, then drawn as a single
+    line strip straight from its contiguous live range.
+    """
+
+    def __init__(self, capacity=500):
+        super().__init__(capacity)
+        self.buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.storage.nbytes, self.storage, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.uploaded_version = self.version
+
+    def draw(self, mode=GL_LINE_STRIP):
+        if self.uploaded_version != self.version:
+            glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, self.storage.nbytes, self.storage)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.uploaded_version = self.version
+        if self.count:
+            draw_buffer(self.buffer, mode, self.start, self.count)
+
+    def delete(self):
+        if self.buffer:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = 0
+
+
+def draw_buffer(buffer, mode, first, count):
+    """Draw `count` 2D float vertices of a buffer object starting at `first`."""
+    glBindBuffer(GL_ARRAY_BUFFER, buffer)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, ctypes.c_void_p(0))
+    glDrawArrays(mode, first, count)
+    glDisableClientState(GL_VERTEX_ARRAY)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def circle_mesh(segments):
+    """Unit circle as `segments` triangles around the origin, a (segments * 3, 2) float32 array.
+
+    Computed once per segment count, balls are this mesh scaled and moved.
+    """
+    theta = np.linspace(0.0, 2.0 * np.pi, segments + 1)
+    rim = np.stack([np.cos(theta), np.sin(theta)], axis=-1)
+    triangles = np.zeros((segments, 3, 2))
+    triangles[:, 1] = rim[:-1]
+    triangles[:, 2] = rim[1:]
+    mesh = triangles.reshape(-1, 2).astype(np.float32)
+    mesh.setflags(write=False)
+    return mesh
+
+
+def draw_balls(positions, radius, colors=None, segments=20):
+    """Draw every ball in a single glDrawArrays call.
+
+    positions is (N, 2), radius a number or (N,) and colors an (N, 3) array of
+    per-ball colors, or None to use the current glColor for all of them.
+    """
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 1, 2)
+    if not len(positions):
+        return
+    mesh = circle_mesh(segments)
+    radius = np.asarray(radius, dtype=np.float32).reshape(-1, 1, 1)
+    vertices = np.ascontiguousarray((positions + radius * mesh).reshape(-1, 2))
+
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_FLOAT, 0, vertices)
+    if colors is not None:
+        colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+        vertex_colors = np.ascontiguousarray(np.repeat(colors, len(mesh), axis=0))
+        glEnableClientState(GL_COLOR_ARRAY)
+        glColorPointer(3, GL_FLOAT, 0, vertex_colors)
+    glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+    if colors is not None:
+        glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
@@ -0,0 +1,117 @@
+"""One window for every simulation, switching scenes instead of windows.
+
+A scene is an object with width, height, enter(), frame(profiler), leave()
+and delete(), plus optional on_mouse_button, on_cursor_pos and on_key input
+handlers with the GLFW callback signatures and an optional shown(), called
+after each frame is swapped to the screen. frame() returns None to keep
+going, False when the scene is over (back to the home scene, or quit without
+one) or the name of the scene to switch to, "exit" to quit.
+
+Scenes are built on first use and then kept until the window closes, so
+their buffers, trails and the glyph atlases of the shared GL context survive
+every switch.
+"""
+import glfw
+from OpenGL.GL import *
+from instrumentation import frame_profiler
+from text import delete_atlases
+from utils import init_window
+
+
+class SceneManager:
+    def __init__(self, window, factories, home=None, profiler=None):
+        self.window = window
+        self.factories = factories  # scene name -> callable returning the scene, called on first use
+        self.home = home
+        self.profiler = profiler or frame_profiler()
+        self.scenes = {}
+        self.name = None
+        self.scene = None
+        glfw.set_mouse_button_callback(window, self._dispatch("on_mouse_button"))
+        glfw.set_cursor_pos_callback(window, self._dispatch("on_cursor_pos"))
+        glfw.set_key_callback(window, self._on_key)
+
+    def _dispatch(self, handler):
+        def callback(window, *args):
+            function = getattr(self.scene, handler, None)
+            if function is not None:
+                function(window, *args)
+        return callback
+
+    def _on_key(self, window, key, scancode, action, mods):
+        if key == glfw.KEY_ESCAPE and action == glfw.PRESS and self.home is not None and self.name != self.home:
+            self.next = self.home
+            return
+        self._dispatch("on_key")(window, key, scancode, action, mods)
+
+    def get(self, name):
+        scene = self.scenes.get(name)
+        if scene is None:
+            scene = self.scenes[name] = self.factories[name]()
+        return scene
+
+    def switch(self, name):
+        if self.scene is not None:
+            self.scene.leave()
+        self.name, self.scene = name, self.get(name)
+        if tuple(glfw.get_window_size(self.window)) != (self.scene.width, self.scene.height):
+            glfw.set_window_size(self.window, self.scene.width, self.scene.height)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(0, self.scene.width, 0, self.scene.height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        self.scene.enter()  # may set its own projection
+
+    def run(self, name):
+        """Show scene `name` and run frames until the window closes or a scene quits."""
+        self.next = None
+        self.switch(name)
+        profiler = self.profiler
+        while not glfw.window_should_close(self.window):
+            profiler.begin_frame()
+            glViewport(0, 0, *glfw.get_framebuffer_size(self.window))
+            result = self.scene.frame(profiler)
+            with profiler.phase("text"):
+                profiler.draw_overlay()
+            with profiler.phase("swap"):
+                glfw.swap_buffers(self.window)
+            shown = getattr(self.scene, "shown", None)
+            if shown is not None:
+                shown()
+            with profiler.phase("poll"):
+                glfw.poll_events()
+            profiler.end_frame()
+
+            if result is False:
+                result = self.home if self.home is not None and self.name != self.home else "exit"
+            if result is None and self.next is not None:
+                result = self.next
+            self.next = None
+            if result == "exit":
+                break
+            if result is not None:
+                self.switch(result)
+        if self.scene is not None:
+            self.scene.leave()
+
+    def close(self):
+        """Free every scene's GPU resources and the context's glyph atlases, while the context still exists."""
+        for scene in self.scenes.values():
+            scene.delete()
+        self.scenes.clear()
+        self.scene = None
+        self.profiler.finish()
+        delete_atlases()
+
+
+def run(scene, title):
+    """Open a window for a single scene (the modules' own main()) and run it to the end."""
+    window = init_window(scene.width, scene.height, title)
+    glfw.swap_interval(1)  # vsync paces the frames instead of sleeping
+    manager = SceneManager(window, {"scene": lambda: scene})
+    try:
+        manager.run("scene")
+    finally:
+        manager.close()
+        glfw.terminate()
@@ -1,27 +1,19 @@
-import pygame
 from OpenGL.GL import *
 import glfw
+from text import draw_text
 
 # Button coordinates (x1, y1, x2, y2)
 projectile_button = (350, 500, 550, 550)
 mi_projectile_button = (350, 400, 550, 450)
-exit_button = (350, 300, 550, 350)
+bouncing_button = (350, 300, 550, 350)
+exit_button = (350, 200, 550, 250)
 
-# Initialize PyGame for font rendering
-pygame.init()
-pygame.font.init()
-font = pygame.font.Font(None, 36)  # Default font, size 36
+def render_text(text, x, y):
+    """Renders white text over the button from the size 36 glyph atlas."""
+    draw_text(text, x, y, 36)
 
-def render_text(text, x, y, background_color):
-    """Renders text as a texture using PyGame and OpenGL."""
-    text_surface = font.render(text, True, (255, 255, 255), background_color)  # White text on button-colored background
-    text_data = pygame.image.tostring(text_surface, "RGBA", True)
-    
-    glRasterPos2f(x, y)  # Position text
-    glDrawPixels(text_surface.get_width(), text_surface.get_height(), GL_RGBA, GL_UNSIGNED_BYTE, text_data)
-
-def draw_start_screen():
-    """Draw the start menu with three buttons."""
+def draw_start_screen(labels=True):
+    """Draw the start menu with four buttons, and their labels unless labels is False (font still loading)."""
     
     # Set background color
     glClearColor(0.0, 0.0, 0.0, 1.0)  # Black background
@@ -35,7 +27,8 @@ def draw_start_screen():
     glVertex2f(projectile_button[2], projectile_button[3])
     glVertex2f(projectile_button[0], projectile_button[3])
     glEnd()
-    render_text("Projectile", 400, 515, (51, 51, 204))
+    if labels:
+        render_text("Projectile", 400, 515)
     
     # Draw MI_projectile button
     glColor3f(0.2, 0.8, 0.2)  # Green
@@ -45,8 +38,20 @@ def draw_start_screen():
     glVertex2f(mi_projectile_button[2], mi_projectile_button[3])
     glVertex2f(mi_projectile_button[0], mi_projectile_button[3])
     glEnd()
-    render_text("MI_projectile", 400, 415, (51, 204, 51))
+    if labels:
+        render_text("MI_projectile", 400, 415)
     
+    # Draw Bouncing button
+    glColor3f(0.8, 0.6, 0.2)  # Orange
+    glBegin(GL_QUADS)
+    glVertex2f(bouncing_button[0], bouncing_button[1])
+    glVertex2f(bouncing_button[2], bouncing_button[1])
+    glVertex2f(bouncing_button[2], bouncing_button[3])
+    glVertex2f(bouncing_button[0], bouncing_button[3])
+    glEnd()
+    if labels:
+        render_text("Bouncing", 400, 315)
+
     # Draw Exit button
     glColor3f(0.8, 0.2, 0.2)  # Red
     glBegin(GL_QUADS)
@@ -55,7 +60,8 @@ def draw_start_screen():
     glVertex2f(exit_button[2], exit_button[3])
     glVertex2f(exit_button[0], exit_button[3])
     glEnd()
-    render_text("Exit", 430, 315, (204, 51, 51))
+    if labels:
+        render_text("Exit", 430, 215)
 
 def handle_start_screen_click(xpos, ypos, window, state):
     """Handles mouse clicks on the start screen buttons."""
@@ -72,6 +78,10 @@ def handle_start_screen_click(xpos, ypos, window, state):
         print("MI_projectile Button Clicked!")
         return "mi_projectile"  # Start MI_projectile simulation
 
+    elif bouncing_button[0] <= xpos <= bouncing_button[2] and bouncing_button[1] <= y_opengl <= bouncing_button[3]:
+        print("Bouncing Button Clicked!")
+        return "bouncing"  # Start the bouncing ball simulation
+
     elif exit_button[0] <= xpos <= exit_button[2] and exit_button[1] <= y_opengl <= exit_button[3]:
         print("Exit Button Clicked!")
         glfw.set_window_should_close(window, True)  # Close window
@@ -0,0 +1,93 @@
+"""Startup timing and background preloading for the menu.
+
+main.py shows the menu before the simulations, pygame, fonts and audio are
+loaded. A Preloader thread loads them while the menu is up, and the first
+scene that needs one just waits for (or, with PRELOAD=0, runs) its task.
+PROFILE_STARTUP=1 prints when each step finished.
+"""
+import os
+import sys
+import threading
+import time
+
+
+class StartupReport:
+    """Named milestones in seconds since `started` (the first line of main.py)."""
+
+    def __init__(self, started, enabled=None):
+        self.started = started
+        self.enabled = os.environ.get("PROFILE_STARTUP", "") not in ("", "0") if enabled is None else enabled
+        self.marks = []
+        self._lock = threading.Lock()
+
+    def mark(self, name, when=None):
+        with self._lock:
+            self.marks.append((name, (time.perf_counter() if when is None else when) - self.started))
+
+    def print(self, file=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+        for name, seconds in marks:
+            print(f"startup {seconds * 1e3:9.1f} ms  {name}", file=file or sys.stderr)
+
+
+class Preloader:
+    """Runs named loading tasks one after another on a daemon thread.
+
+    result(name) returns a task's value, waiting for it if it is still
+    running, running it right away if the thread has not reached it (or
+    background loading is off) and re-raising its exception on the caller's
+    thread. Tasks must not touch GL, which belongs to the main thread.
+    """
+
+    def __init__(self, tasks, report=None, background=None):
+        self.tasks = dict(tasks)
+        self.report = report
+        self._results = {}
+        self._done = {name: threading.Event() for name in self.tasks}
+        self._claimed = set()
+        self._lock = threading.Lock()
+        if background is None:
+            background = os.environ.get("PRELOAD", "1") != "0"
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self._run_all, name="preload", daemon=True)
+            self.thread.start()
+
+    def _claim(self, name):
+        with self._lock:
+            if name in self._claimed:
+                return False
+            self._claimed.add(name)
+            return True
+
+    def _run(self, name):
+        started = time.perf_counter()
+        try:
+            self._results[name] = (True, self.tasks[name]())
+        except BaseException as e:  # handed to whoever asks for the result
+            self._results[name] = (False, e)
+        if self.report is not None:
+            self.report.mark(f"{name} loaded ({(time.perf_counter() - started) * 1e3:.1f} ms, "
+                             f"{'main' if threading.current_thread() is threading.main_thread() else 'preload'} thread)")
+        self._done[name].set()
+
+    def _run_all(self):
+        for name in self.tasks:
+            if self._claim(name):
+                self._run(name)
+
+    def ready(self, name):
+        """Whether result(name) would return without waiting on the thread."""
+        return self.thread is None or self._done[name].is_set()
+
+    def result(self, name):
+        if self._claim(name):
+            self._run(name)
+        self._done[name].wait()
+        ok, value = self._results[name]
+        if not ok:
+            raise value
+        return value
@@ -0,0 +1,90 @@
+import struct
+import numpy as np
+
+# File layout:
+#   header  (32 bytes) magic, version, itemsize, trajectory count, index offset, data offset
+#   data    every trajectory's (N, 2) points back to back, float32 or float64
+#   index   one (start row, row count) record per trajectory
+MAGIC = b"TRAJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxQQQ")
+INDEX_DTYPE = np.dtype([("start", "<u8"), ("length", "<u8")])
+DTYPES = {4: np.dtype("<f4"), 8: np.dtype("<f8")}
+
+
+def write_store(path, trajectories, dtype=np.float32):
+    """Write an iterable of (N, 2) point arrays to path and return how many were written.
+
+    Trajectories are streamed to disk one at a time, only the index is kept in memory.
+    """
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype.itemsize not in DTYPES or dtype.kind != "f":
+        raise ValueError("store data must be float32 or float64")
+
+    index = []
+    rows = 0
+    with open(path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        data_offset = HEADER.size
+        for points in trajectories:
+            points = np.ascontiguousarray(points, dtype=dtype).reshape(-1, 2)
+            f.write(points.tobytes())
+            index.append((rows, len(points)))
+            rows += len(points)
+
+        index_offset = data_offset + rows * 2 * dtype.itemsize
+        f.write(np.array(index, dtype=INDEX_DTYPE).tobytes())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, dtype.itemsize, len(index), index_offset, data_offset))
+    return len(index)
+
+
+class TrajectoryStore:
+    """Read-only view of a file written by write_store.
+
+    Both the index and the points are numpy.memmap arrays, so store[i] is a
+    zero-copy (N, 2) view that only pages in the rows it touches.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            magic, version, itemsize, count, index_offset, data_offset = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or itemsize not in DTYPES:
+            raise ValueError(f"{path} is not a trajectory store")
+
+        self.path = path
+        self.dtype = DTYPES[itemsize]
+        rows = (index_offset - data_offset) // (2 * itemsize)
+        if count:
+            self.index = np.memmap(path, INDEX_DTYPE, "r", offset=index_offset, shape=(count,))
+        else:
+            self.index = np.empty(0, INDEX_DTYPE)
+        if rows:
+            self.data = np.memmap(path, self.dtype, "r", offset=data_offset, shape=(rows, 2))
+        else:
+            self.data = np.empty((0, 2), self.dtype)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        start, length = (int(v) for v in self.index[i])
+        return self.data[start:start + length]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def lengths(self):
+        return self.index["length"]
+
+    def close(self):
+        """Drop the memory maps. Views handed out earlier keep the file mapped."""
+        self.index = self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
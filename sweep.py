@@ -0,0 +1,190 @@
+"""Sweep launch parameters over a grid on every core and report flight metrics.
+
+    python -m sweep --speed 10 300 200 --angle 5 85 81 --restitution-y 0.3 0.9 7 -o metrics.csv
+    python -m sweep --speed 10 300 200 --angle 5 85 81 --method stepped --drag-quadratic 0.001 --wind -5 0
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from analytic import BounceTrajectory
+from batch import ProjectileBatch
+from forces import Drag, Wind
+from integrators import INTEGRATORS
+
+METRICS = np.dtype([
+    ("speed", "f8"), ("angle", "f8"), ("gravity", "f8"), ("restitution_x", "f8"), ("restitution_y", "f8"),
+    ("range", "f8"), ("apex", "f8"), ("flight_time", "f8"), ("bounces", "i4"),
+])
+
+
+class Grid:
+    """Cartesian product of parameter axes, addressed by flat index so it is never materialized."""
+
+    def __init__(self, speeds, angles, gravities=(9.81,), restitutions_x=(0.4,), restitutions_y=(0.7,)):
+        self.axes = tuple(np.atleast_1d(np.asarray(a, dtype=np.float64))
+                          for a in (speeds, angles, gravities, restitutions_x, restitutions_y))
+        self.shape = tuple(len(a) for a in self.axes)
+
+    def __len__(self):
+        return math.prod(self.shape)
+
+    def params(self, start, stop):
+        """(speed, angle, gravity, rx, ry) arrays for flat indices start..stop."""
+        idx = np.unravel_index(np.arange(start, stop), self.shape)
+        return tuple(axis[i] for axis, i in zip(self.axes, idx))
+
+
+def summarize_analytic(speed, angle, gravity, rx, ry, start=(50, 50)):
+    """Metrics from BounceTrajectory, the closed form of MIprojectile.calculate_points."""
+    out = np.empty(len(speed), METRICS)
+    for i in range(len(speed)):
+        flight = BounceTrajectory(speed[i] * math.cos(angle[i]), speed[i] * math.sin(angle[i]), gravity[i], start,
+                                  (rx[i], ry[i]))
+        out["range"][i] = flight.landing_x - start[0]
+        out["apex"][i] = max([start[1]] + [y for _, _, y in flight.apexes])
+        out["flight_time"][i] = flight.end_time
+        out["bounces"][i] = flight.bounces
+    return out
+
+
+def summarize_stepped(speed, angle, gravity, rx, ry, start=(50, 50), dt=0.01, integrator="euler", drag=None,
+                      wind=None):
+    """Metrics from stepping the whole chunk at once with ProjectileBatch, the only method supporting drag."""
+    batch = ProjectileBatch.from_launches(speed, angle, start, gravity, integrator=integrator, drag=drag, wind=wind)
+    batch.restitution[:, 0] = rx
+    batch.restitution[:, 1] = ry
+    apex = batch.positions[:, 1].copy()
+    steps = np.zeros(len(batch), np.int64)
+    bounces = np.zeros(len(batch), np.int32)
+    while batch.active.any():
+        steps += batch.active
+        bounced, _ = batch.step(dt)
+        bounces += bounced
+        np.maximum(apex, batch.positions[:, 1], out=apex)
+
+    out = np.empty(len(batch), METRICS)
+    out["range"] = batch.positions[:, 0] - start[0]
+    out["apex"] = apex
+    out["flight_time"] = steps * dt
+    out["bounces"] = bounces
+    return out
+
+
+def summarize_trajectory(speed, angle, gravity, rx, ry, max_bounces=3):
+    """Metrics of the Projectile.calculate_trajectory model (ground launch, ry as e), in closed form.
+
+    That model keeps the horizontal speed on every bounce, so rx is unused and
+    reported as NaN.
+    """
+    vy = speed * np.sin(angle)
+    e_powers = ry[:, None] ** np.arange(max_bounces + 1)
+    flight_time = (2 * vy / gravity)[:, None] * e_powers
+
+    out = np.empty(len(speed), METRICS)
+    out["range"] = speed * np.cos(angle) * flight_time.sum(axis=1)
+    out["apex"] = vy**2 / (2 * gravity)
+    out["flight_time"] = flight_time.sum(axis=1)
+    out["bounces"] = max_bounces
+    return out
+
+
+SUMMARIZERS = {
+    "analytic": summarize_analytic,
+    "stepped": summarize_stepped,
+    "trajectory": summarize_trajectory,
+}
+
+
+def run_chunk(grid, start, stop, method, options):
+    params = grid.params(start, stop)
+    out = SUMMARIZERS[method](*params, **options)
+    for name, values in zip(METRICS.names[:5], params):
+        out[name] = values
+    if method == "trajectory":
+        out["restitution_x"] = np.nan  # not a parameter of this model
+    return start, out
+
+
+def sweep(grid, method="analytic", workers=None, chunk_size=10000, **options):
+    """Yield (first index, metrics array) for each chunk of the grid as workers finish.
+
+    Only the per-launch METRICS records cross the process boundary, never point
+    lists. options go to the summarizer, e.g. dt, integrator, drag and wind for
+    the stepped method.
+    """
+    if method not in SUMMARIZERS:
+        raise ValueError(f"unknown sweep method {method!r}")
+    if method != "stepped" and (options.get("drag") is not None or options.get("wind") is not None):
+        raise ValueError("drag and wind have no closed form, use method='stepped'")
+    if method == "trajectory" and len(grid.axes[3]) > 1:
+        raise ValueError("the trajectory method has no horizontal restitution, sweep only restitution_y")
+    chunks = [(start, min(start + chunk_size, len(grid))) for start in range(0, len(grid), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_chunk, grid, start, stop, method, options) for start, stop in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def axis(parser, values):
+    """Parse an axis given as VALUE or START STOP COUNT."""
+    if len(values) == 1:
+        return np.array(values)
+    if len(values) != 3:
+        parser.error("axes take VALUE or START STOP COUNT")
+    return np.linspace(values[0], values[1], int(values[2]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="sweep", description=__doc__.splitlines()[0])
+    parser.add_argument("--speed", type=float, nargs="+", required=True, help="m/s, VALUE or START STOP COUNT")
+    parser.add_argument("--angle", type=float, nargs="+", required=True, help="degrees, VALUE or START STOP COUNT")
+    parser.add_argument("--gravity", type=float, nargs="+", default=[9.81])
+    parser.add_argument("--restitution-x", type=float, nargs="+", help="default 0.4, not used by --method trajectory")
+    parser.add_argument("--restitution-y", type=float, nargs="+", default=[0.7])
+    parser.add_argument("--method", choices=sorted(SUMMARIZERS), default="analytic",
+                        help="analytic/stepped: MIprojectile rules, trajectory: Projectile.py arcs")
+    parser.add_argument("--dt", type=float, default=0.01, help="time step for --method stepped")
+    parser.add_argument("--integrator", choices=sorted(INTEGRATORS), default="euler",
+                        help="scheme for --method stepped")
+    parser.add_argument("--drag-linear", type=float, default=0.0, help="linear drag coefficient (1/s)")
+    parser.add_argument("--drag-quadratic", type=float, default=0.0, help="quadratic drag coefficient (1/m)")
+    parser.add_argument("--wind", type=float, nargs=2, metavar=("VX", "VY"), help="steady wind velocity")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--output", "-o", help="CSV file, stdout by default")
+    args = parser.parse_args(argv)
+
+    if args.method == "trajectory" and args.restitution_x is not None:
+        parser.error("--method trajectory keeps the horizontal speed on bounces, --restitution-x has no effect")
+    grid = Grid(axis(parser, args.speed), np.radians(axis(parser, args.angle)), axis(parser, args.gravity),
+                axis(parser, args.restitution_x or [0.4]), axis(parser, args.restitution_y))
+    if args.wind and not (args.drag_linear or args.drag_quadratic):
+        parser.error("--wind only acts through drag, it needs --drag-linear or --drag-quadratic")
+    options = {}
+    if args.method == "stepped":
+        options = {"dt": args.dt, "integrator": args.integrator}
+        if args.drag_linear or args.drag_quadratic:
+            options["drag"] = Drag(args.drag_linear, args.drag_quadratic)
+            options["wind"] = Wind(args.wind) if args.wind else None
+    elif args.drag_linear or args.drag_quadratic or args.wind:
+        parser.error("drag and wind need --method stepped")
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    started = time.perf_counter()
+    try:
+        out.write(",".join(METRICS.names) + "\n")
+        for _, metrics in sweep(grid, args.method, args.workers, args.chunk_size, **options):
+            metrics["angle"] = np.degrees(metrics["angle"])
+            np.savetxt(out, metrics, fmt="%.6g", delimiter=",")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(grid)} launches in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
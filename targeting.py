@@ -0,0 +1,140 @@
+import numpy as np
+from physics import GROUND_LEVEL, X_MIN, STOP_VX, STOP_VY, restitution_pair
+from batch import ProjectileBatch
+
+
+def min_speed_shots(targets, start=(50, 50), g=9.81):
+    """Slowest direct shot to each target, as (speeds, angles in radians) arrays."""
+    dx, dy = _offsets(targets, start)
+    reach = np.sqrt(dx**2 + dy**2)
+    speeds = np.sqrt(g * (dy + reach))
+    angles = np.arctan2(dy + reach, dx)
+    return speeds, angles
+
+
+def direct_angles(speeds, targets, start=(50, 50), g=9.81):
+    """(low, high) launch angles hitting each target at the given speeds, NaN where out of reach."""
+    dx, dy = _offsets(targets, start)
+    v2 = np.asarray(speeds, dtype=np.float64) ** 2
+    with np.errstate(invalid="ignore"):
+        root = np.sqrt(v2**2 - g * (g * dx**2 + 2 * dy * v2))
+    low = np.arctan2(v2 - root, g * dx)
+    high = np.arctan2(v2 + root, g * dx)
+    return low, high
+
+
+def solve_speeds(angles, targets, bounces=0, start=(50, 50), g=9.81, restitution=(0.4, 0.7), drag=None, wind=None,
+                 dt=0.01, speed_range=(1.0, 500.0), samples=16, rounds=4, tol=1.0):
+    """Launch speeds at fixed angles that pass through each target after `bounces` bounces.
+
+    The target is hit while coming down on arc `bounces`. Without drag, the
+    direct shot is solved in closed form and bounced shots are evaluated with
+    the exact arc formulas. With drag, every round steps a ProjectileBatch of
+    samples * len(targets) trial shots. In both cases the speed bracket of
+    all targets is narrowed together for `rounds` rounds and the result is
+    checked once more: NaN marks targets with no solution in speed_range or
+    whose final shot passes further than tol from them.
+    """
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    angles = np.broadcast_to(np.asarray(angles, dtype=np.float64), (len(targets),))
+    if bounces == 0 and drag is None:
+        dx, dy = _offsets(targets, start)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            v2 = g * dx**2 / (2 * np.cos(angles) ** 2 * (dx * np.tan(angles) - dy))
+        speeds = np.sqrt(np.where(v2 > 0, v2, np.nan))
+        return np.where((speeds >= speed_range[0]) & (speeds <= speed_range[1]), speeds, np.nan)
+
+    if drag is None:
+        def crossing(speeds, angle, target_y):
+            return _crossing_analytic(speeds, angle, target_y, bounces, start, g, restitution)
+    else:
+        def crossing(speeds, angle, target_y):
+            return _crossing_stepped(speeds, angle, target_y, bounces, start, g, restitution, drag, wind, dt)
+
+    lo = np.full(len(targets), float(speed_range[0]))
+    hi = np.full(len(targets), float(speed_range[1]))
+    found = np.zeros(len(targets), dtype=bool)
+    for _ in range(rounds):
+        # samples trial speeds per target, evaluated as one flat batch
+        trial = lo[:, None] + (hi - lo)[:, None] * np.linspace(0.0, 1.0, samples)
+        x = crossing(trial.ravel(), np.repeat(angles, samples), np.repeat(targets[:, 1], samples))
+        miss = np.nan_to_num(x.reshape(trial.shape) - targets[:, 0:1], nan=-np.inf)
+        # first trial speed that reaches past the target brackets the solution
+        past = miss >= 0
+        found = past[:, 1:].any(axis=1) & ~past[:, 0]
+        k = np.argmax(past, axis=1).clip(1)
+        rows = np.arange(len(targets))
+        new_lo, new_hi = trial[rows, k - 1], trial[rows, k]
+        lo = np.where(found, new_lo, lo)
+        hi = np.where(found, new_hi, hi)
+        last_miss = (miss[rows, k - 1], miss[rows, k])
+
+    # linear interpolation inside the final bracket
+    m0, m1 = last_miss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(np.isfinite(m0) & (m1 != m0), -m0 / (m1 - m0), 0.0)
+    speeds = np.where(found, lo + (hi - lo) * np.clip(fraction, 0.0, 1.0), np.nan)
+    # a bracket can also open where the arc first reaches the target height, past the target
+    with np.errstate(invalid="ignore"):
+        hit = np.abs(crossing(np.nan_to_num(speeds, nan=speed_range[0]), angles, targets[:, 1]) - targets[:, 0]) <= tol
+    return np.where(hit, speeds, np.nan)
+
+
+def _offsets(targets, start):
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 2)
+    return targets[:, 0] - start[0], targets[:, 1] - start[1]
+
+
+def _crossing_analytic(speeds, angles, target_y, bounces, start, g, restitution):
+    """x where arc `bounces` comes down through target_y, NaN if it never does."""
+    rx, ry = restitution_pair(restitution)
+    vx = speeds * np.cos(angles)
+    vy = speeds * np.sin(angles)
+    x = np.full(len(speeds), float(start[0]))
+    y = np.full(len(speeds), float(start[1]))
+    alive = np.ones(len(speeds), dtype=bool)
+    for _ in range(bounces):
+        tau = (vy + np.sqrt(np.maximum(vy**2 + 2 * g * (y - GROUND_LEVEL), 0.0))) / g
+        x = x + vx * tau
+        y = np.full_like(y, GROUND_LEVEL)
+        vy = (g * tau - vy) * ry
+        vx = vx * rx
+        alive &= ~((np.abs(vy) < STOP_VY) & (np.abs(vx) < STOP_VX))
+
+    # Descending root of y + vy t - g t^2 / 2 = target_y
+    with np.errstate(invalid="ignore"):
+        t = (vy + np.sqrt(vy**2 + 2 * g * (y - target_y))) / g
+    above_ground = target_y >= GROUND_LEVEL
+    return np.where(alive & above_ground & (t >= 0), x + vx * t, np.nan)
+
+
+def _crossing_stepped(speeds, angles, target_y, bounces, start, g, restitution, drag, wind, dt):
+    """Like _crossing_analytic, measured by stepping every trial shot with drag.
+
+    Shots that leave the bounds over the top or the far side before coming
+    down through target_y flew past it and give +inf instead of NaN.
+    """
+    batch = ProjectileBatch.from_launches(speeds, angles, start, g, restitution, drag=drag, wind=wind)
+    n = len(batch)
+    hit_x = np.full(n, np.nan)
+    bounce_count = np.zeros(n, np.int64)
+    previous = batch.positions.copy()
+    previous_vy = np.zeros(n)
+    while batch.active.any():
+        previous[:] = batch.positions
+        previous_vy[:] = batch.velocities[:, 1]
+        on_arc = bounce_count == bounces
+        bounced, out_of_bounds = batch.step(dt)
+        bounce_count += bounced
+        y0, y1 = previous[:, 1], batch.positions[:, 1]
+        # the bounce step ends snapped to the ground, carry on its velocity below it instead
+        y1 = np.where(bounced, np.minimum(y1, y0 + previous_vy * dt), y1)
+        crossed = on_arc & (y0 >= target_y) & (y1 <= target_y) & (y0 > y1) & np.isnan(hit_x)
+        if crossed.any():
+            f = (y0[crossed] - target_y[crossed]) / (y0[crossed] - y1[crossed])
+            hit_x[crossed] = previous[crossed, 0] + f * (batch.positions[crossed, 0] - previous[crossed, 0])
+        overshot = out_of_bounds & (batch.positions[:, 0] >= X_MIN) & np.isnan(hit_x)
+        hit_x[overshot] = np.inf
+        # done once the target height is passed or the shot bounced beyond the arc we want
+        batch.active &= np.isnan(hit_x) & (bounce_count <= bounces)
+    return hit_x
@@ -1,5 +1,6 @@
 import math
-
+import sys
+from export import export
 
 
 x0 = 0
@@ -12,13 +13,15 @@ rad_angle = math.radians(angle)
 v_x = u * math.cos(rad_angle)
 v_y = u * math.sin(rad_angle)
 
-def calcPoints(x0, y0, g, dt, v_x, v_y):
-    points = []
-    while y0>=0: 
+def iterPoints(x0, y0, g, dt, v_x, v_y):
+    while y0>=0:
         x0 += v_x*dt
         y0 += v_y*dt
         v_y -= g*dt
-        points.append((x0, y0))
-    return points
+        yield (x0, y0)
+
+def calcPoints(x0, y0, g, dt, v_x, v_y):
+    return list(iterPoints(x0, y0, g, dt, v_x, v_y))
 
-print(calcPoints(x0, y0, g, dt, v_x, v_y))
\ No newline at end of file
+if __name__ == "__main__":
+    export(iterPoints(x0, y0, g, dt, v_x, v_y), "-", ("x", "y"), sys.argv[1] if len(sys.argv) > 1 else "csv")
@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from OpenGL import contextdata
+from OpenGL.GL import *
+
+CHARACTERS = "".join(chr(c) for c in range(32, 127)) + "°"
+ATLAS_WIDTH = 1024
+
+_rasters = {}  # font size -> (line height, glyphs, atlas height, RGBA pixels)
+_raster_lock = threading.Lock()
+
+
+def rasterize(font_size):
+    """Render every glyph of a font size into atlas pixels, once per size.
+
+    Only CPU work with pygame, no GL, so it can run on a worker thread ahead of
+    the first draw (see startup.Preloader). pygame itself is imported here, on
+    first use, as it is slow to import.
+    """
+    with _raster_lock:
+        raster = _rasters.get(font_size)
+        if raster is not None:
+            return raster
+        import pygame
+        pygame.font.init()
+        font = pygame.font.Font(None, font_size)
+        height = font.get_height()
+
+        # Pack the glyphs left to right in rows of ATLAS_WIDTH pixels
+        surfaces = {c: font.render(c, True, (255, 255, 255)) for c in CHARACTERS}
+        places = {}
+        x = y = 0
+        for c, surface in surfaces.items():
+            if x + surface.get_width() > ATLAS_WIDTH:
+                x, y = 0, y + height
+            places[c] = (x, y)
+            x += surface.get_width()
+        atlas_height = y + height
+
+        atlas = pygame.Surface((ATLAS_WIDTH, atlas_height), pygame.SRCALPHA)
+        atlas.fill((255, 255, 255, 0))
+        glyphs = {}  # char -> (advance, u0, v0, u1, v1)
+        for c, surface in surfaces.items():
+            gx, gy = places[c]
+            atlas.blit(surface, (gx, gy))
+            w = surface.get_width()
+            # the texture is uploaded flipped, so v runs bottom to top
+            glyphs[c] = (w, gx / ATLAS_WIDTH, 1 - (gy + height) / atlas_height,
+                         (gx + w) / ATLAS_WIDTH, 1 - gy / atlas_height)
+
+        raster = _rasters[font_size] = (height, glyphs, atlas_height, pygame.image.tostring(atlas, "RGBA", True))
+        return raster
+
+
+class GlyphAtlas:
+    """Every glyph of one font size rasterized once into a single GL texture.
+
+    Strings are laid out into quad vertex/texcoord arrays once and kept in a
+    small LRU, so drawing text is a texture bind plus one glDrawArrays per batch.
+    """
+
+    def __init__(self, font_size=24, max_strings=256):
+        self.height, self.glyphs, atlas_height, pixels = rasterize(font_size)
+        self.max_strings = max_strings
+        self._strings = OrderedDict()
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, ATLAS_WIDTH, atlas_height, 0, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+    def layout(self, text):
+        """(vertices, texcoords) of the quads for text with its origin at (0, 0), cached per string."""
+        quads = self._strings.get(text)
+        if quads is not None:
+            self._strings.move_to_end(text)
+            return quads
+
+        vertices = np.empty((len(text), 4, 2), np.float32)
+        texcoords = np.empty((len(text), 4, 2), np.float32)
+        x = 0
+        for i, c in enumerate(text):
+            w, u0, v0, u1, v1 = self.glyphs.get(c, self.glyphs["?"])
+            vertices[i] = ((x, 0), (x + w, 0), (x + w, self.height), (x, self.height))
+            texcoords[i] = ((u0, v0), (u1, v0), (u1, v1), (u0, v1))
+            x += w
+        quads = (vertices.reshape(-1, 2), texcoords.reshape(-1, 2))
+
+        self._strings[text] = quads
+        if len(self._strings) > self.max_strings:
+            self._strings.popitem(last=False)
+        return quads
+
+    def width(self, text):
+        return sum(self.glyphs.get(c, self.glyphs["?"])[0] for c in text)
+
+    def draw(self, items, color=(1, 1, 1)):
+        """Draw (text, x, y) items in one call. x, y are window pixels from the bottom left."""
+        if not items:
+            return
+        vertices = []
+        texcoords = []
+        for text, x, y in items:
+            quad_vertices, quad_texcoords = self.layout(text)
+            vertices.append(quad_vertices + np.array((x, y), np.float32))
+            texcoords.append(quad_texcoords)
+        vertices = np.concatenate(vertices)
+        texcoords = np.concatenate(texcoords)
+
+        # Text is placed in window pixels whatever projection the scene uses
+        _, _, width, height = glGetIntegerv(GL_VIEWPORT)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, width, 0, height, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glPushMatrix()
+        glLoadIdentity()
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT | GL_CURRENT_BIT)
+
+        glEnable(GL_TEXTURE_2D)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glColor3f(*color)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        glDrawArrays(GL_QUADS, 0, len(vertices))
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        glPopAttrib()
+        glPopMatrix()
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+
+    def delete(self):
+        if self.texture:
+            glDeleteTextures([self.texture])
+            self.texture = 0
+
+
+_atlases = {}  # (GL context, font size) -> GlyphAtlas
+
+
+def get_atlas(font_size=24):
+    """The atlas for font_size in the current GL context, built on first use."""
+    key = (contextdata.getContext(), font_size)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(font_size)
+    return atlas
+
+
+def delete_atlases():
+    """Delete the atlases of the current GL context, before the context itself goes away."""
+    context = contextdata.getContext()
+    for key in [key for key in _atlases if key[0] == context]:
+        _atlases.pop(key).delete()
+
+
+def draw_text(text, x, y, font_size=24, color=(1, 1, 1)):
+    get_atlas(font_size).draw([(text, x, y)], color)
@@ -0,0 +1,45 @@
+import time
+
+
+class FixedTimestep:
+    """Accumulator that turns wall-clock frame times into a whole number of fixed physics steps.
+
+    Every frame call advance() and run that many steps of dt; alpha is then how far
+    (0..1) the real time has moved past the last step, for interpolating what is drawn.
+    time_scale is simulated seconds per wall second and max_steps caps the catch-up
+    after a stall so a slow frame cannot snowball into ever slower ones.
+    """
+
+    def __init__(self, dt, time_scale=1.0, max_steps=250, clock=time.perf_counter):
+        self.dt = dt
+        self.time_scale = time_scale
+        self.max_steps = max_steps
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Start counting from now, dropping any accumulated time."""
+        self.last_time = self.clock()
+        self.accumulator = 0.0
+
+    def advance(self, now=None):
+        """Return how many dt steps are due since the previous call."""
+        now = self.clock() if now is None else now
+        self.accumulator += (now - self.last_time) * self.time_scale
+        self.last_time = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = steps * self.dt  # drop the time we can't catch up on
+        self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
+
+
+def interpolate(previous, current, alpha):
+    """Blend two positions, alpha=0 gives previous and alpha=1 gives current."""
+    return [p + (c - p) * alpha for p, c in zip(previous, current)]
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class RingTrail:
+    """Fixed-capacity trail of 2D points in one preallocated float32 array.
+
+    Appending writes into the next slot (overwriting the oldest point once
+    full) without allocating. Every point is stored at slot i and again at
+    i + capacity, so the live points are always the contiguous slice
+    storage[start:start + count], usable as-is as a vertex array.
+    """
+
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self.storage = np.zeros((2 * capacity, 2), np.float32)
+        self.next = 0  # slot the next point goes to
+        self.count = 0
+        self.version = 0  # bumped on every change, lets GPU copies know they are stale
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.points)
+
+    def append(self, point):
+        i = self.next
+        self.storage[i, 0] = self.storage[i + self.capacity, 0] = point[0]
+        self.storage[i, 1] = self.storage[i + self.capacity, 1] = point[1]
+        self.next = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+        self.version += 1
+
+    def clear(self):
+        self.next = 0
+        self.count = 0
+        self.version += 1
+
+    @property
+    def start(self):
+        return (self.next - self.count) % self.capacity
+
+    @property
+    def points(self):
+        """(count, 2) view of the trail from oldest to newest point."""
+        return self.storage[self.start:self.start + self.count]
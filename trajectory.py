@@ -0,0 +1,53 @@
+import math
+import numpy as np
+
+TIME_STEPS = 300  # samples per bounce arc (plus the start point), playback relies on this spacing
+
+
+def compute_trajectory(speed, angle, gravity, start_x=0, start_y=0, time_steps=TIME_STEPS, max_bounces=3, e=0.7):
+    """Compute every bounce arc of a projectile in one pass with NumPy.
+
+    Returns (arcs, flight_times, speed, angle, start_x, start_y, bounce_times,
+    max_heights) where each arc is a contiguous (N, 2) float64 array.
+    """
+    arcs = []
+    flight_times = []
+    bounce_times = []
+    max_heights = []
+    steps = np.arange(time_steps + 1, dtype=np.float64)
+
+    for bounce in range(max_bounces + 1):
+        sin_a = math.sin(angle)
+        cos_a = math.cos(angle)
+        t_flight = (2 * speed * sin_a) / gravity
+        t = steps * (t_flight / time_steps)
+
+        points = np.empty((time_steps + 1, 2))
+        points[:, 0] = start_x + speed * cos_a * t
+        points[:, 1] = start_y + (speed * sin_a * t) - (0.5 * gravity * t**2)
+
+        # Cut the arc at the first sample below ground, that sample is the impact
+        below = np.flatnonzero(points[:, 1] < 0)
+        if below.size:
+            bounce_times.append(float(t[below[0]]))
+            points = points[:below[0]]
+
+        max_heights.append(max(0.0, float(points[:, 1].max())) if len(points) else 0.0)
+        arcs.append(points)
+        flight_times.append(t_flight)
+
+        if bounce < max_bounces and len(points) > 0:
+            # Bounce physics
+            vy_new = e * speed * sin_a  # Reverse and reduce vertical component
+            vx = speed * cos_a
+
+            speed = math.sqrt(vx**2 + vy_new**2)
+            angle = math.atan(vy_new / vx) if vx != 0 else 0
+            start_x, start_y = float(points[-1, 0]), float(points[-1, 1])
+
+    return arcs, flight_times, speed, angle, start_x, start_y, bounce_times, max_heights
+
+
+def as_tuples(points):
+    """Convert an (N, 2) array into the list of (x, y) tuples used by the drawing code."""
+    return [tuple(p) for p in points.tolist()]